@@ -23,12 +23,13 @@ class GdpHttpClient:
     """
     Class for initializing the conditions of a http connection with GDP
     """
-    def __init__(self, name, ip, port_number, unique_key=None):
+    def __init__(self, name, ip, port_number, unique_key=None, timeout=None):
         self.ip = ip
         self.port_number = port_number
         self.name = name
         self.info = 'GdpHttpClient instance'
         self.unique_key = unique_key
+        self.timeout = timeout # seconds to wait for GDP, None waits forever
         self.lock = threading.Lock() # lock to use to keep all communications synchronized
 
     def make_Command(self, command, extra_parameters=None):
@@ -50,17 +51,18 @@ class GdpHttpClient:
             method = requests.post
         else:
             method = requests.get
-        return Command(url, method, self.lock)
+        return Command(url, method, self.lock, self.timeout)
 
 
 class Command:
     """
     Class for executing a single command prepared by the GdpHttpClient
     """
-    def __init__(self, url, method, lock):
+    def __init__(self, url, method, lock, timeout=None):
         self.url = url
         self.method = method
         self.lock = lock
+        self.timeout = timeout
 
     def Send(self):
         """
@@ -70,7 +72,7 @@ class Command:
         self.lock.acquire()
         # todo: log this (call and response)
         try:
-            response = self.method(url = self.url)
+            response = self.method(url = self.url, timeout = self.timeout)
         finally:
             self.lock.release()
 
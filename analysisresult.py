@@ -0,0 +1,71 @@
+# analysisresult.py
+
+import numpy as np
+import pandas as pd
+
+
+def as_column(values):
+    """Typed 1-D column for `values`; NumPy arrays and pandas objects are used without copying."""
+    if isinstance(values, (np.ndarray, pd.Series, pd.Index)):
+        return np.asarray(values)
+    # Let pandas infer the dtype: datetime64 for times, float64 for offsets, object for text
+    return pd.Series(list(values)).to_numpy()
+
+
+class AnalysisResult:
+    """
+    Per-segment analysis results. Every field is one typed NumPy column and
+    all sentence embeddings live in a single contiguous float32 (n, dim)
+    matrix, so clustering and indexing read the matrix directly instead of
+    re-stacking per-row objects. `to_pandas` builds a DataFrame over the same
+    column buffers for the plots.
+    """
+    def __init__(self, columns=None, embeddings=None):
+        self.columns = {}
+        for name, values in (columns or {}).items():
+            self[name] = values
+        if embeddings is None:
+            embeddings = np.zeros((len(self), 0), dtype=np.float32)
+        self.embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if self.columns and len(self.embeddings) != len(self):
+            raise ValueError(f"Got {len(self.embeddings)} embeddings for {len(self)} segments")
+
+    @classmethod
+    def from_records(cls, records, embeddings=None):
+        """Build a result from a list of segment dicts, e.g. the transcription."""
+        names = list(records[0].keys()) if records else []
+        return cls({name: [record[name] for record in records] for name in names}, embeddings)
+
+    @classmethod
+    def from_pandas(cls, frame, embeddings=None):
+        return cls({name: frame[name].to_numpy() for name in frame.columns}, embeddings)
+
+    def __len__(self):
+        if self.columns:
+            return len(next(iter(self.columns.values())))
+        return 0 if getattr(self, 'embeddings', None) is None else len(self.embeddings)
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __setitem__(self, name, values):
+        column = as_column(values)
+        if self.columns and len(column) != len(self):
+            raise ValueError(f"Column {name} has {len(column)} rows, expected {len(self)}")
+        self.columns[name] = column
+
+    @property
+    def column_names(self):
+        return list(self.columns)
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    def to_pandas(self, columns=None):
+        """DataFrame over the selected columns, sharing their buffers."""
+        names = self.column_names if columns is None else [name for name in columns if name in self.columns]
+        return pd.DataFrame({name: self.columns[name] for name in names}, copy=False)
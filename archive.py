@@ -0,0 +1,169 @@
+# archive.py
+
+import os
+import json
+import hashlib
+import argparse
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import soundfile as sf
+
+BLOCK_FRAMES = 65536  # Frames decoded per block when streaming
+
+
+def metadata_path(audio_path):
+    """Path of the sidecar metadata written next to an archived recording."""
+    return os.path.splitext(audio_path)[0] + ".meta.json"
+
+
+def legacy_metadata_path(audio_path):
+    # Name the metadata was first written under
+    return os.path.splitext(audio_path)[0] + ".idx.json"
+
+
+def audio_info(audio_path):
+    """Return (frames, sample rate, channels) of a WAV or FLAC recording without decoding it."""
+    info = sf.info(audio_path)
+    return info.frames, info.samplerate, info.channels
+
+
+def iter_blocks(audio_path, blocksize=BLOCK_FRAMES, start=0, stop=None, dtype='float32'):
+    """Decode a recording block by block, seeking straight to `start` (in frames)."""
+    return sf.blocks(audio_path, blocksize=blocksize, start=start, stop=stop, dtype=dtype, always_2d=True)
+
+
+def read_segment(audio_path, start_seconds, end_seconds, dtype='float32'):
+    """Decode only the frames between two times, as a (frames, channels) array."""
+    _, rate, _ = audio_info(audio_path)
+    data, _ = sf.read(audio_path, start=int(start_seconds * rate), stop=int(end_seconds * rate),
+                      dtype=dtype, always_2d=True)
+    return data, rate
+
+
+def pcm_digest(audio_path):
+    """
+    SHA-256 of the decoded 16-bit samples, identical for a WAV recording and
+    its FLAC archive. Archived recordings keep the digest in their metadata.
+    """
+    if audio_path.endswith('.flac'):
+        for path in (metadata_path(audio_path), legacy_metadata_path(audio_path)):
+            try:
+                with open(path, 'r') as f:
+                    return json.load(f)['pcm_sha256']
+            except (FileNotFoundError, json.JSONDecodeError, KeyError):
+                pass
+    digest = hashlib.sha256()
+    for block in iter_blocks(audio_path, dtype='int16'):
+        digest.update(np.ascontiguousarray(block).tobytes())
+    return digest.hexdigest()
+
+
+def write_archive(flac_path, blocks, fs, channels, source_path=None):
+    """
+    Encode int16 blocks into a lossless FLAC file and write its metadata.
+    libsndfile seeks within FLAC files itself, so readers decode only the
+    frames they need; the metadata records the format and a digest of the
+    samples for verification. Both files are written under a temporary name
+    and moved into place once complete, after checking that the FLAC decodes
+    to exactly the samples of `source_path` if one is given.
+    """
+    digest = hashlib.sha256()
+    frames = 0
+    tmp_path = flac_path + '.tmp'
+    try:
+        with sf.SoundFile(tmp_path, 'w', samplerate=fs, channels=channels, format='FLAC', subtype='PCM_16') as f:
+            for block in blocks:
+                block = np.ascontiguousarray(block, dtype=np.int16).reshape(-1, channels)
+                f.write(block)
+                digest.update(block.tobytes())
+                frames += len(block)
+        if source_path is not None and not verify_archive(source_path, tmp_path):
+            raise ValueError(f"Archive of {source_path} does not match the original samples")
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, flac_path)
+
+    meta_path = metadata_path(flac_path)
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump({'frames': frames, 'samplerate': fs, 'channels': channels,
+                   'pcm_sha256': digest.hexdigest()}, f, indent=4)
+    os.replace(meta_path + '.tmp', meta_path)
+    return digest.hexdigest()
+
+
+def save_archive(flac_path, samples, fs):
+    """Save int16 samples of shape (frames,) or (frames, channels) as an archived recording."""
+    samples = np.asarray(samples, dtype=np.int16)
+    channels = 1 if samples.ndim == 1 else samples.shape[1]
+    samples = samples.reshape(-1, channels)
+    blocks = (samples[i:i + BLOCK_FRAMES] for i in range(0, len(samples), BLOCK_FRAMES))
+    write_archive(flac_path, blocks, fs, channels)
+
+
+def verify_archive(wav_path, flac_path):
+    """Check block by block that a FLAC archive decodes to exactly the WAV samples."""
+    wav_blocks = iter_blocks(wav_path, dtype='int16')
+    flac_blocks = iter_blocks(flac_path, dtype='int16')
+    for wav_block in wav_blocks:
+        flac_block = next(flac_blocks, None)
+        if flac_block is None or not np.array_equal(wav_block, flac_block):
+            return False
+    return next(flac_blocks, None) is None
+
+
+def migrate_recording(wav_path, remove_wav=False):
+    """Convert one audio.wav to audio.flac, verify it bit-exactly, optionally drop the WAV."""
+    flac_path = os.path.splitext(wav_path)[0] + ".flac"
+    _, fs, channels = audio_info(wav_path)
+    # Verified before it replaces anything, so an interrupted run leaves no partial archive
+    write_archive(flac_path, iter_blocks(wav_path, dtype='int16'), fs, channels, source_path=wav_path)
+    saved = os.path.getsize(wav_path) - os.path.getsize(flac_path)
+    if remove_wav:
+        os.remove(wav_path)
+    return flac_path, saved
+
+
+def find_unarchived(trials_dir):
+    for root, _, files in os.walk(trials_dir):
+        if "audio.wav" in files and "audio.flac" not in files:
+            yield os.path.join(root, "audio.wav")
+
+
+def migrate(trials_dir, workers=None, remove_wav=False):
+    """Archive every recording under trials_dir in parallel worker processes."""
+    wav_paths = list(find_unarchived(trials_dir))
+    logging.info(f"Archiving {len(wav_paths)} recordings from {trials_dir}.")
+    failures = 0
+    total_saved = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(migrate_recording, path, remove_wav): path for path in wav_paths}
+        for future in as_completed(futures):
+            try:
+                flac_path, saved = future.result()
+                total_saved += saved
+                logging.info(f"Archived {futures[future]} -> {flac_path} ({saved / 1e6:.1f} MB saved)")
+            except Exception as e:
+                failures += 1
+                logging.error(f"Failed to archive {futures[future]}: {e}")
+    logging.info(f"Archived {len(wav_paths) - failures} recordings, {failures} failures, "
+                 f"{total_saved / 1e6:.1f} MB saved.")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert recorded audio.wav files to lossless FLAC archives.")
+    parser.add_argument("trials_dir", nargs='?', default="trials", help="Folder holding sess_*/rec_* recordings")
+    parser.add_argument("--workers", type=int, default=None, help="Number of parallel worker processes")
+    parser.add_argument("--remove-wav", action="store_true", help="Delete each WAV once its archive is verified")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    failures = migrate(args.trials_dir, workers=args.workers, remove_wav=args.remove_wav)
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
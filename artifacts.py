@@ -0,0 +1,124 @@
+# artifacts.py
+
+import os
+import json
+import pickle
+import hashlib
+import logging
+from archive import pcm_digest
+
+# Bump this whenever the layout of a stage's payload or the way it is
+# computed changes, so stale artifacts are recomputed instead of loaded.
+ARTIFACT_VERSION = 2
+
+ARTIFACTS_DIR = "artifacts"
+
+
+def hash_texts(texts):
+    """Return a short digest identifying a list of transcript texts."""
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(text.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+
+class ArtifactStore:
+    """
+    Versioned, per-recording cache of pipeline stage outputs.
+
+    Every artifact lives in <recording_folder>/artifacts/ and is keyed by a
+    hash of the audio samples, the stage name and the stage settings. The
+    samples are hashed rather than the file, so a WAV recording and its FLAC
+    archive share their artifacts. A stage whose inputs are unchanged is
+    loaded from disk instead of recomputed, so an interrupted run resumes at
+    the first missing stage.
+    """
+    def __init__(self, audio_path):
+        self.audio_path = audio_path
+        self.folder = os.path.join(os.path.dirname(audio_path), ARTIFACTS_DIR)
+        os.makedirs(self.folder, exist_ok=True)
+        self._audio_hash = None
+
+    @property
+    def audio_hash(self):
+        if self._audio_hash is None:
+            self._audio_hash = self._load_audio_hash()
+        return self._audio_hash
+
+    def _load_audio_hash(self):
+        # Hashing a long recording is not free, so remember the digest along
+        # with the size and mtime it was computed for.
+        stat = os.stat(self.audio_path)
+        cache_path = os.path.join(self.folder, "audio_hash.json")
+        try:
+            with open(cache_path, 'r') as f:
+                cached = json.load(f)
+            if (cached.get('name') == os.path.basename(self.audio_path)
+                    and cached.get('size') == stat.st_size
+                    and cached.get('mtime') == stat.st_mtime):
+                return cached['sha256']
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+
+        audio_hash = pcm_digest(self.audio_path)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'name': os.path.basename(self.audio_path), 'size': stat.st_size,
+                       'mtime': stat.st_mtime, 'sha256': audio_hash}, f)
+        os.replace(tmp_path, cache_path)
+        return audio_hash
+
+    def key(self, stage, settings):
+        payload = json.dumps({'audio': self.audio_hash, 'stage': stage,
+                              'version': ARTIFACT_VERSION, 'settings': settings},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:24]
+
+    def path(self, stage, settings):
+        return os.path.join(self.folder, f"{stage}_{self.key(stage, settings)}.pkl")
+
+    def load(self, stage, settings):
+        """Return the cached output of a stage, or None if it is missing or stale."""
+        path = self.path(stage, settings)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                artifact = pickle.load(f)
+        except Exception as e:
+            logging.warning(f"Discarding unreadable artifact {path}: {e}")
+            return None
+        if artifact.get('version') != ARTIFACT_VERSION or artifact.get('stage') != stage:
+            return None
+        return artifact['data']
+
+    def save(self, stage, settings, data):
+        path = self.path(stage, settings)
+        artifact = {'version': ARTIFACT_VERSION, 'stage': stage,
+                    'settings': settings, 'audio': self.audio_hash, 'data': data}
+        # Write to a temporary file first so an interrupted run never leaves
+        # a truncated artifact behind.
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        logging.debug(f"Saved artifact {path}")
+
+    def load_or_compute(self, stage, settings, compute):
+        """Load a stage from disk, or run compute() and persist its result."""
+        data = self.load(stage, settings)
+        if data is not None:
+            logging.info(f"Reusing cached '{stage}' artifact.")
+            return data
+        logging.info(f"Computing '{stage}' stage.")
+        data = compute()
+        self.save(stage, settings, data)
+        return data
+
+
+def cached_stage(store, stage, settings, compute):
+    """Run a stage through the store if one is given, otherwise compute directly."""
+    if store is None:
+        return compute()
+    return store.load_or_compute(stage, settings, compute)
@@ -0,0 +1,115 @@
+# capturemetrics.py
+
+import os
+import json
+import math
+import time
+import threading
+import numpy as np
+
+CAPTURE_METRICS_FILE = "capture_metrics.json"
+
+# Level meter scale, in dB relative to full scale
+METER_FLOOR_DB = -60.0
+
+
+def to_dbfs(value):
+    return float(20 * np.log10(max(value, 1e-6)))
+
+
+class CaptureMetrics:
+    """
+    Health of the capture loop, updated once per block by the recording
+    thread and read by the UI from the main loop.
+
+    Counts input overflows reported by the stream, keeps the duration of
+    the last `history` reads and how many frames were already waiting in
+    the stream buffer before each read, and derives an RMS/peak level per
+    block from every `decimation`-th sample so metering stays cheap.
+    """
+    def __init__(self, sample_rate, block_size=1024, decimation=8, history=4096, backlog_warning_blocks=4):
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.decimation = decimation
+        self.backlog_warning_blocks = backlog_warning_blocks
+        # The backlog warning looks at about the last second of reads only
+        self.recent_blocks = min(max(1, math.ceil(sample_rate / block_size)), history)
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.blocks = 0
+        self.overflows = 0
+        self.last_overflow = None  # Seconds into the recording
+        self.read_latencies = np.zeros(history, dtype=np.float32)  # Ring of read durations in seconds
+        self.occupancies = np.zeros(history, dtype=np.int32)  # Ring of frames waiting before each read
+        self.max_occupancy = 0
+        self.rms = 0.0
+        self.peak = 0.0
+        self.max_peak = 0.0
+
+    def record_read(self, latency, overflowed, available, block):
+        """Account for one stream.read() of `block`, which took `latency` seconds."""
+        samples = block[::self.decimation]
+        rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float32)))) if samples.size else 0.0
+        peak = float(np.max(np.abs(samples))) if samples.size else 0.0
+        with self.lock:
+            slot = self.blocks % len(self.read_latencies)
+            self.read_latencies[slot] = latency
+            self.occupancies[slot] = available
+            self.max_occupancy = max(self.max_occupancy, available)
+            self.blocks += 1
+            if overflowed:
+                self.overflows += 1
+                self.last_overflow = self.blocks * self.block_size / self.sample_rate
+            self.rms = rms
+            self.peak = peak
+            self.max_peak = max(self.max_peak, peak)
+
+    @property
+    def warning(self):
+        """Short description of a capture problem, or None while capture is healthy."""
+        with self.lock:
+            if self.overflows:
+                return f"{self.overflows} overflow{'s' if self.overflows > 1 else ''}, audio was dropped"
+            count = min(self.blocks, self.recent_blocks)
+            recent = np.arange(self.blocks - count, self.blocks) % len(self.occupancies)
+            if count and self.occupancies[recent].max() >= self.backlog_warning_blocks * self.block_size:
+                return "Capture is falling behind"
+        return None
+
+    def level(self):
+        """(rms, peak) of the latest block in dBFS."""
+        with self.lock:
+            return to_dbfs(self.rms), to_dbfs(self.peak)
+
+    def summary(self):
+        with self.lock:
+            count = min(self.blocks, len(self.read_latencies))
+            latencies = self.read_latencies[:count] * 1000
+            occupancies = self.occupancies[:count]
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if count else (0.0, 0.0, 0.0)
+            return {
+                'sample_rate': self.sample_rate,
+                'block_size': self.block_size,
+                'blocks': self.blocks,
+                'duration_s': self.blocks * self.block_size / self.sample_rate,
+                'wall_time_s': time.time() - self.started,
+                'overflows': self.overflows,
+                'last_overflow_s': self.last_overflow,
+                'read_latency_ms': {
+                    'p50': float(p50),
+                    'p95': float(p95),
+                    'p99': float(p99),
+                    'max': float(latencies.max()) if count else 0.0,
+                },
+                'buffer_occupancy_frames': {
+                    'mean': float(occupancies.mean()) if count else 0.0,
+                    'max': int(self.max_occupancy),
+                },
+                'peak_dbfs': to_dbfs(self.max_peak),
+            }
+
+    def save(self, recording_folder):
+        path = os.path.join(recording_folder, CAPTURE_METRICS_FILE)
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=4)
+        return path
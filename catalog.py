@@ -0,0 +1,283 @@
+# catalog.py
+
+import os
+import json
+import time
+import sqlite3
+import argparse
+import threading
+import logging
+from datetime import datetime
+from archive import audio_info
+from capturemetrics import CAPTURE_METRICS_FILE
+from resultsio import load_analysis_results
+
+CATALOG_PATH = os.path.join("trials", "catalog.sqlite")
+
+# Processing status of a recording
+RECORDED = 'recorded'
+ANALYZED = 'analyzed'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recordings (
+    folder TEXT PRIMARY KEY,
+    session TEXT,
+    recording TEXT,
+    start_time TEXT,
+    audio_path TEXT,
+    audio_format TEXT,
+    duration_s REAL,
+    sample_rate INTEGER,
+    channels INTEGER,
+    param_snapshots INTEGER,
+    stim_states TEXT,
+    overflows INTEGER,
+    num_speakers INTEGER,
+    status TEXT,
+    error TEXT,
+    artifacts TEXT,
+    source_mtime REAL,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS recordings_start_time ON recordings (start_time);
+CREATE INDEX IF NOT EXISTS recordings_status ON recordings (status);
+"""
+
+
+def recording_start_time(folder):
+    """Start time encoded in a trials/sess_DDMMYY/rec_HHMMSS path, or None."""
+    session = os.path.basename(os.path.dirname(os.path.normpath(folder)))
+    recording = os.path.basename(os.path.normpath(folder))
+    try:
+        return datetime.strptime(session[len("sess_"):] + recording[len("rec_"):], "%d%m%y%H%M%S")
+    except ValueError:
+        return None
+
+
+def find_audio(folder):
+    for name in ("audio.flac", "audio.wav"):
+        path = os.path.join(folder, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def source_files(folder):
+    """Files whose contents the catalog row is derived from."""
+    names = ["audio.flac", "audio.wav", "params.json", CAPTURE_METRICS_FILE]
+    paths = [os.path.join(folder, name) for name in names]
+    paths += [os.path.join(folder, name) for name in os.listdir(folder)
+              if name.startswith("analysis_") and name.endswith(".parquet")]
+    return [path for path in paths if os.path.exists(path)]
+
+
+def summarize_parameters(params_path):
+    """(number of parameter snapshots, distinct stimulation states) from params.json."""
+    try:
+        with open(params_path, 'r') as f:
+            snapshots = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return 0, []
+    states = sorted({str(item['parameters'].get('State')) for item in snapshots
+                     if item.get('parameters') and item['parameters'].get('State') is not None})
+    return len(snapshots), states
+
+
+class Catalog:
+    """
+    SQLite index of the recordings under trials/, one row per recording
+    folder. Rows are written when a recording is saved or analyzed, and
+    `scan` only re-reads folders whose files changed since they were
+    indexed, so listing and filtering never touches the audio.
+    """
+    def __init__(self, path=CATALOG_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.lock = threading.Lock()
+        # Shared by the capture, analysis and GUI threads, serialized by the lock
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(SCHEMA)
+
+    def _upsert(self, folder, fields):
+        fields = dict(fields, folder=os.path.normpath(folder), updated_at=time.time())
+        columns = ', '.join(fields)
+        placeholders = ', '.join('?' for _ in fields)
+        updates = ', '.join(f"{column} = excluded.{column}" for column in fields if column != 'folder')
+        with self.lock, self.connection:
+            self.connection.execute(
+                f"INSERT INTO recordings ({columns}) VALUES ({placeholders}) "
+                f"ON CONFLICT(folder) DO UPDATE SET {updates}", list(fields.values()))
+
+    def index_recording(self, folder):
+        """(Re)index a recording folder from the files in it."""
+        audio_path = find_audio(folder)
+        if audio_path is None:
+            return False
+        frames, rate, channels = audio_info(audio_path)
+        param_snapshots, states = summarize_parameters(os.path.join(folder, "params.json"))
+        start_time = recording_start_time(folder)
+
+        overflows = None
+        try:
+            with open(os.path.join(folder, CAPTURE_METRICS_FILE), 'r') as f:
+                overflows = json.load(f).get('overflows')
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+        files = source_files(folder)
+        results = [path for path in files if path.endswith(".parquet")]
+        fields = {
+            'session': os.path.basename(os.path.dirname(os.path.normpath(folder))),
+            'recording': os.path.basename(os.path.normpath(folder)),
+            'start_time': start_time.isoformat() if start_time else None,
+            'audio_path': audio_path,
+            'audio_format': os.path.splitext(audio_path)[1][1:],
+            'duration_s': frames / rate,
+            'sample_rate': rate,
+            'channels': channels,
+            'param_snapshots': param_snapshots,
+            'stim_states': ','.join(states),
+            'overflows': overflows,
+            'artifacts': json.dumps(self._artifacts(folder)),
+            'source_mtime': max(os.path.getmtime(path) for path in files),
+        }
+        if results:
+            # Speaker labels are the same in every model's results
+            speakers, _ = load_analysis_results(results[0], columns=['speaker'])
+            fields.update(status=ANALYZED, num_speakers=len(set(speakers['speaker'])))
+        elif self.get(folder) is None:
+            fields['status'] = RECORDED
+        self._upsert(folder, fields)
+        return True
+
+    def _artifacts(self, folder):
+        names = sorted(os.listdir(folder))
+        artifacts = {
+            'results': [os.path.join(folder, name) for name in names
+                        if name.startswith("analysis_") and name.endswith(".parquet")],
+        }
+        for key, name in (('params', "params.json"), ('capture_metrics', CAPTURE_METRICS_FILE),
+                          ('segment_index', "segment_index.npy"), ('stage_cache', "artifacts")):
+            if name in names:
+                artifacts[key] = os.path.join(folder, name)
+        return artifacts
+
+    def record_analysis(self, folder, status, num_speakers=None, error=None):
+        """Update the processing status once an analysis finishes or fails."""
+        if self.get(folder) is None:
+            self.index_recording(folder)
+        fields = {'status': status, 'error': error, 'artifacts': json.dumps(self._artifacts(folder)),
+                  'source_mtime': max(os.path.getmtime(path) for path in source_files(folder))}
+        if num_speakers is not None:
+            fields['num_speakers'] = num_speakers
+        self._upsert(folder, fields)
+
+    def get(self, folder):
+        with self.lock:
+            row = self.connection.execute("SELECT * FROM recordings WHERE folder = ?",
+                                          (os.path.normpath(folder),)).fetchone()
+        return dict(row) if row else None
+
+    def scan(self, trials_dir="trials"):
+        """
+        Bring the catalog up to date with trials_dir: index new or changed
+        recordings and forget deleted ones. Returns (indexed, removed).
+        """
+        with self.lock:
+            known = {row['folder']: row['source_mtime'] for row in
+                     self.connection.execute("SELECT folder, source_mtime FROM recordings")}
+        seen = set()
+        indexed = 0
+        for root, _, files in os.walk(trials_dir):
+            if "audio.wav" not in files and "audio.flac" not in files:
+                continue
+            folder = os.path.normpath(root)
+            seen.add(folder)
+            mtime = max(os.path.getmtime(path) for path in source_files(folder))
+            if known.get(folder) is not None and known[folder] >= mtime:
+                continue
+            try:
+                indexed += self.index_recording(folder)
+            except Exception as e:
+                logging.error(f"Failed to index {folder}: {e}")
+
+        prefix = os.path.normpath(trials_dir) + os.sep
+        removed = [folder for folder in known if folder not in seen and folder.startswith(prefix)]
+        with self.lock, self.connection:
+            self.connection.executemany("DELETE FROM recordings WHERE folder = ?", [(folder,) for folder in removed])
+        logging.info(f"Catalog scan of {trials_dir}: {indexed} indexed, {len(removed)} removed.")
+        return indexed, len(removed)
+
+    def query(self, since=None, until=None, min_duration=None, max_duration=None, speakers=None,
+              state=None, status=None, session=None, limit=None):
+        """Recordings matching every given filter, newest first."""
+        clauses, values = [], []
+        for clause, value in (("start_time >= ?", since.isoformat() if since else None),
+                              ("start_time <= ?", until.isoformat() if until else None),
+                              ("duration_s >= ?", min_duration),
+                              ("duration_s <= ?", max_duration),
+                              ("num_speakers = ?", speakers),
+                              ("status = ?", status),
+                              ("session = ?", session)):
+            if value is not None:
+                clauses.append(clause)
+                values.append(value)
+        if state is not None:
+            clauses.append("(',' || stim_states || ',') LIKE ?")
+            values.append(f"%,{state},%")
+        sql = "SELECT * FROM recordings"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY start_time DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self.lock:
+            return [dict(row) for row in self.connection.execute(sql, values)]
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+def format_recording(row):
+    """One-line rendering of a catalog row for consoles and the Recordings tab."""
+    duration = f"{row['duration_s'] / 60:.1f} min" if row['duration_s'] is not None else "?"
+    speakers = f"{row['num_speakers']} speakers" if row['num_speakers'] is not None else "speakers ?"
+    states = row['stim_states'] or "-"
+    overflows = f", {row['overflows']} overflows" if row['overflows'] else ""
+    return (f"{row['start_time'] or row['folder']}  {duration}  {row['channels']}ch @ {row['sample_rate']} Hz  "
+            f"{speakers}  stim: {states}  [{row['status']}]{overflows}  {row['folder']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List and filter the recordings under trials/.")
+    parser.add_argument("--trials-dir", default="trials", help="Folder holding sess_*/rec_* recordings")
+    parser.add_argument("--scan", action="store_true", help="Index new or changed recordings first")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None, help="Earliest start, e.g. 2024-05-01")
+    parser.add_argument("--until", type=datetime.fromisoformat, default=None, help="Latest start")
+    parser.add_argument("--min-duration", type=float, default=None, help="Minimum duration in seconds")
+    parser.add_argument("--max-duration", type=float, default=None, help="Maximum duration in seconds")
+    parser.add_argument("--speakers", type=int, default=None, help="Number of speakers found by the analysis")
+    parser.add_argument("--state", default=None, help="Stimulation state seen during the recording")
+    parser.add_argument("--status", choices=[RECORDED, ANALYZED, FAILED], default=None)
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    catalog = Catalog(os.path.join(args.trials_dir, "catalog.sqlite"))
+    if args.scan:
+        catalog.scan(args.trials_dir)
+    rows = catalog.query(since=args.since, until=args.until, min_duration=args.min_duration,
+                         max_duration=args.max_duration, speakers=args.speakers, state=args.state,
+                         status=args.status, limit=args.limit)
+    for row in rows:
+        print(format_recording(row))
+    print(f"{len(rows)} recordings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# crosssession.py
+
+import os
+import pickle
+import threading
+import logging
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import IncrementalPCA
+from modelids import model_slug
+
+CLUSTER_MODELS_DIR = os.path.join("trials", "cluster_models")
+
+
+class CrossSessionClusterModel:
+    """
+    Topic clustering shared by every recording analyzed with one sentence model.
+
+    Centroids are updated with MiniBatchKMeans.partial_fit as each session is
+    analyzed, and the 2-D projection comes from an IncrementalPCA that is
+    frozen once it has seen `projection_warmup` phrases, so cluster ids and
+    plot coordinates stay comparable across sessions.
+    """
+    def __init__(self, path, n_clusters=8, projection_warmup=500):
+        self.path = path
+        self.n_clusters = n_clusters
+        self.projection_warmup = projection_warmup
+        self.kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=42, n_init=3)
+        self.pca = IncrementalPCA(n_components=2)
+        self.kmeans_fitted = False
+        self.pca_samples = 0
+        self.sessions = set()
+        self._pending = []  # Phrases held back until there are enough for a first fit
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, model_id, n_clusters=8):
+        path = os.path.join(CLUSTER_MODELS_DIR, f"{model_slug(model_id)}.pkl")
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    model = pickle.load(f)
+                model.path = path
+                logging.info(f"Loaded cross-session cluster model from {path} ({len(model.sessions)} sessions).")
+                return model
+            except Exception as e:
+                logging.error(f"Failed to load cross-session cluster model {path}: {e}")
+        return cls(path, n_clusters=n_clusters)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self.kmeans_fitted and self.pca_samples > 0
+
+    def update(self, embeddings, session_id):
+        """Feed one session's phrase embeddings into the model, once per session."""
+        with self.lock:
+            if session_id in self.sessions:
+                logging.debug(f"Session {session_id} already in cross-session model, skipping update.")
+                return
+            self._pending.append(np.asarray(embeddings, dtype=np.float32))
+            batch = np.concatenate(self._pending, axis=0)
+
+            # Both estimators need a minimum batch size for their first fit.
+            if not self.kmeans_fitted and len(batch) < self.n_clusters:
+                self.sessions.add(session_id)
+                self._save()
+                return
+            self._pending = []
+
+            self.kmeans.partial_fit(batch)
+            self.kmeans_fitted = True
+            if self.pca_samples < self.projection_warmup and len(batch) >= 2:
+                previous = None if self.pca_samples == 0 else self.pca.components_.copy()
+                self.pca.partial_fit(batch)
+                self.pca_samples += len(batch)
+                # Keep the axes from flipping sign between updates.
+                if previous is not None:
+                    signs = np.sign(np.sum(previous * self.pca.components_, axis=1))
+                    signs[signs == 0] = 1
+                    self.pca.components_ *= signs[:, np.newaxis]
+
+            self.sessions.add(session_id)
+            self._save()
+
+    def assign(self, embeddings):
+        """Return (cluster labels, 2-D components) without refitting anything."""
+        with self.lock:
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+            return self.kmeans.predict(embeddings), self.pca.transform(embeddings)
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
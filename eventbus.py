@@ -0,0 +1,65 @@
+# eventbus.py
+
+import time
+import queue
+from collections import namedtuple
+
+Event = namedtuple('Event', ['kind', 'timestamp', 'payload'])
+
+# Event kinds published by the workers
+MESSAGE = 'message'    # payload: title, message, level ('info', 'warning' or 'error')
+PROGRESS = 'progress'  # payload: stage, fraction (0..1, or None when unknown)
+RESULT = 'result'      # payload: name plus whatever the producer attaches
+
+
+class EventBus:
+    """
+    Thread-safe, non-blocking channel from worker threads to whoever
+    displays their progress. Publishing never waits; the GUI drains the bus
+    from the Tk main loop, and batch or headless runs can drain or wait on it
+    from their own thread.
+    """
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+
+    def publish(self, kind, **payload):
+        self._queue.put(Event(kind, time.time(), payload))
+
+    def message(self, title, message, level='info'):
+        self.publish(MESSAGE, title=title, message=message, level=level)
+
+    def progress(self, stage, fraction=None):
+        self.publish(PROGRESS, stage=stage, fraction=fraction)
+
+    def drain(self, max_events=None):
+        """Return every pending event (at most max_events) without blocking."""
+        events = []
+        while max_events is None or len(events) < max_events:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def wait(self, timeout=None):
+        """Block until the next event arrives; returns None on timeout."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+def format_event(event):
+    """One-line, human readable rendering of an event for logs and consoles."""
+    stamp = time.strftime('%H:%M:%S', time.localtime(event.timestamp))
+    payload = event.payload
+    if event.kind == MESSAGE:
+        return f"[{stamp}] {payload['level'].upper()} {payload['title']}: {payload['message']}"
+    if event.kind == PROGRESS:
+        fraction = payload.get('fraction')
+        percent = f" ({fraction:.0%})" if fraction is not None else ""
+        return f"[{stamp}] {payload['stage']}{percent}"
+    # Results can carry data for the UI (frames, transcripts); only name those
+    details = ', '.join(f"{key}={value if isinstance(value, (str, int, float, bool, type(None))) else type(value).__name__}"
+                        for key, value in payload.items())
+    return f"[{stamp}] {event.kind}: {details}"
@@ -0,0 +1,134 @@
+# gdp_loadtest.py
+
+import time
+import argparse
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from GdpHttpClient import GdpHttpClient
+from gdp_simulator import GdpSimulator
+
+# Commands fired by the load generator, in the mix the application sends them
+LOAD_COMMANDS = ['GetStimulationParameters', 'GetStimulationStatus', 'GetStimulationParameters', 'StartRecording',
+                 'GetStimulationParameters', 'StopRecording']
+
+
+def timed_send(ip, port, unique_key, command, name, timeout):
+    """Send one command the way send_gdp_command does; return (seconds, ok)."""
+    client = GdpHttpClient(name=name, ip=ip, port_number=str(port), unique_key=unique_key, timeout=timeout)
+    cmd = client.make_Command(command)
+    started = time.perf_counter()
+    try:
+        response = cmd.Send()
+        ok = response.status_code == 200 and 'Access not allowed' not in response.text
+    except Exception:
+        ok = False
+    return time.perf_counter() - started, ok
+
+
+def summarize(label, latencies, failures):
+    if not latencies:
+        return f"{label}: no requests"
+    ms = np.array(latencies) * 1000
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+    return (f"{label}: n={len(ms)} failures={failures} p50={p50:.1f}ms p90={p90:.1f}ms "
+            f"p99={p99:.1f}ms max={ms.max():.1f}ms")
+
+
+def poll(ip, port, unique_key, interval, duration, timeout):
+    """
+    Mirror periodic_request: one GetStimulationParameters every `interval`
+    seconds. Returns request latencies, failures and how late each poll started.
+    """
+    latencies, lateness, failures = [], [], 0
+    started = time.perf_counter()
+    next_poll = started
+    while next_poll - started < duration:
+        now = time.perf_counter()
+        if now < next_poll:
+            time.sleep(next_poll - now)
+        lateness.append(time.perf_counter() - next_poll)
+        seconds, ok = timed_send(ip, port, unique_key, 'GetStimulationParameters', 'loadtestPoll', timeout)
+        latencies.append(seconds)
+        failures += not ok
+        next_poll += interval
+    return latencies, failures, lateness
+
+
+def run_load(ip, port, unique_key, concurrency, requests_per_worker, timeout):
+    def worker(worker_id):
+        results = []
+        for i in range(requests_per_worker):
+            command = LOAD_COMMANDS[(worker_id + i) % len(LOAD_COMMANDS)]
+            results.append(timed_send(ip, port, unique_key, command, f'loadtest{worker_id}', timeout))
+        return results
+
+    latencies, failures = [], 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for results in executor.map(worker, range(concurrency)):
+            for seconds, ok in results:
+                latencies.append(seconds)
+                failures += not ok
+    return latencies, failures
+
+
+def run(ip, port, unique_key, concurrency, requests_per_worker, poll_interval, poll_duration, timeout):
+    """Measure the polling path alone, then the load and the polling path together."""
+    report = []
+    latencies, failures, _ = poll(ip, port, unique_key, poll_interval, poll_duration, timeout)
+    report.append(summarize("Polling, idle", latencies, failures))
+
+    poll_result = []
+    poller = threading.Thread(target=lambda: poll_result.append(
+        poll(ip, port, unique_key, poll_interval, poll_duration, timeout)))
+    poller.start()
+    started = time.perf_counter()
+    latencies, failures = run_load(ip, port, unique_key, concurrency, requests_per_worker, timeout)
+    elapsed = time.perf_counter() - started
+    poller.join()
+
+    report.append(summarize(f"Load, {concurrency} workers", latencies, failures)
+                  + f" throughput={len(latencies) / elapsed:.1f} req/s")
+    poll_latencies, poll_failures, lateness = poll_result[0]
+    report.append(summarize("Polling, under load", poll_latencies, poll_failures))
+    lateness = np.array(lateness) * 1000
+    report.append(f"Poll start lateness under load: mean={lateness.mean():.1f}ms max={lateness.max():.1f}ms")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the GDP client and polling path.")
+    parser.add_argument("--ip", default=None, help="Target an existing GDP server instead of the local simulator")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unique-key", default="12345abcde")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=50, help="Requests per worker")
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--poll-duration", type=float, default=5.0)
+    parser.add_argument("--timeout", type=float, default=5.0, help="Client timeout in seconds")
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulator base latency")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Simulator latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Simulator error rate")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Simulator stall rate")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    simulator = None
+    ip, port = args.ip, args.port
+    if ip is None:
+        simulator = GdpSimulator(port=0, unique_key=args.unique_key, latency=args.latency, jitter=args.jitter,
+                                 error_rate=args.error_rate, timeout_rate=args.timeout_rate,
+                                 timeout_delay=args.timeout * 2, seed=42).start()
+        ip, port = simulator.host, simulator.port
+    try:
+        for line in run(ip, port, args.unique_key, args.concurrency, args.requests,
+                        args.poll_interval, args.poll_duration, args.timeout):
+            print(line)
+    finally:
+        if simulator is not None:
+            simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
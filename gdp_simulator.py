@@ -0,0 +1,219 @@
+# gdp_simulator.py
+
+import copy
+import json
+import time
+import random
+import argparse
+import threading
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import GdpHttpClient as gdp
+
+DEFAULT_PARAMETERS = {
+    'State': 'Off',
+    'LoopMode': 'Continuous',
+    'StimColumns': [{
+        'Duration': 1000,
+        'RampingDuration': 100,
+        'StimRows': [{'FrequencyPeriod': 130, 'Amplitude': 1.0}],
+    }],
+    'Waveforms': [{'Name': 'Biphasic'}],
+}
+
+# Commands that only acknowledge the request
+ACKNOWLEDGED_COMMANDS = {
+    gdp.RequestAccess, gdp.ListenTo, gdp.StopListenTo, gdp.StimLine, gdp.StimEvent,
+    gdp.SetStimulationBlocks, gdp.SetupDataReceiver,
+}
+
+
+class GdpSimulator:
+    """
+    Local stand-in for the GDP HTTP server, for tests and load tests.
+
+    Every response waits `latency` seconds plus up to `jitter` seconds.
+    A fraction `error_rate` of requests fail with HTTP 500 and a fraction
+    `timeout_rate` stall for `timeout_delay` seconds before answering.
+    `script` is a list of {"at": seconds, "parameters": {...}} steps whose
+    parameters are merged into the stimulation parameters once that many
+    seconds have passed since start().
+    """
+    def __init__(self, host='127.0.0.1', port=8080, unique_key=None, latency=0.0, jitter=0.0,
+                 error_rate=0.0, timeout_rate=0.0, timeout_delay=30.0, script=None, seed=None):
+        self.host = host
+        self.port = port
+        self.unique_key = unique_key
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_delay = timeout_delay
+        self.script = sorted(script or [], key=lambda step: step['at'])
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.parameters = copy.deepcopy(DEFAULT_PARAMETERS)
+        self.recording = False
+        self.listeners = set()
+        self.request_counts = {}
+        self.server = None
+        self.thread = None
+        self.started_at = None
+
+    def start(self):
+        handler = type('BoundGdpRequestHandler', (GdpRequestHandler,), {'simulator': self})
+        self.server = ThreadingHTTPServer((self.host, self.port), handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]  # Resolve port 0 to the bound port
+        self.started_at = time.time()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        logging.info(f"GDP simulator listening on {self.host}:{self.port}")
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _apply_script(self):
+        elapsed = time.time() - self.started_at
+        while self.script and self.script[0]['at'] <= elapsed:
+            step = self.script.pop(0)
+            self._merge_parameters(step['parameters'])
+            logging.info(f"GDP simulator applied scripted parameters at {step['at']}s: {step['parameters']}")
+
+    def _merge_parameters(self, update):
+        for key, value in update.items():
+            if key == 'Amplitude':
+                self.parameters['StimColumns'][0]['StimRows'][0]['Amplitude'] = value
+            elif key == 'FrequencyPeriod':
+                self.parameters['StimColumns'][0]['StimRows'][0]['FrequencyPeriod'] = value
+            else:
+                self.parameters[key] = value
+
+    def handle(self, command, query, body):
+        """Return (status code, response text) for one GDP command."""
+        with self.lock:
+            self.request_counts[command] = self.request_counts.get(command, 0) + 1
+            self._apply_script()
+
+            if self.unique_key is not None and query.get('UniqueKey') != self.unique_key:
+                return 200, 'Access not allowed'
+
+            if command == gdp.GetStimulationStatus:
+                return 200, json.dumps({'State': self.parameters['State'], 'Recording': self.recording})
+            if command in (gdp.GetStimulationParameters, gdp.GetEventParameters):
+                return 200, json.dumps(self.parameters)
+            if command == gdp.StimOn:
+                self.parameters['State'] = 'On'
+            elif command == gdp.StimOff:
+                self.parameters['State'] = 'Off'
+            elif command == gdp.StartRecording:
+                self.recording = True
+            elif command == gdp.StopRecording:
+                self.recording = False
+            elif command in (gdp.SetAmplitude, gdp.SetRelativeAmplitude):
+                try:
+                    amplitude = float(query.get('Amplitude', 0))
+                except ValueError:
+                    return 400, 'Invalid Amplitude'
+                row = self.parameters['StimColumns'][0]['StimRows'][0]
+                row['Amplitude'] = amplitude if command == gdp.SetAmplitude else row['Amplitude'] * amplitude
+            elif command == gdp.SetStimulationParameters:
+                try:
+                    self._merge_parameters(json.loads(body) if body else {})
+                except (json.JSONDecodeError, AttributeError):
+                    return 400, 'Invalid parameters'
+            elif command in ACKNOWLEDGED_COMMANDS:
+                if command == gdp.ListenTo:
+                    self.listeners.add(query.get('Name'))
+                elif command == gdp.StopListenTo:
+                    self.listeners.discard(query.get('Name'))
+            else:
+                return 404, f'Unknown command {command}'
+            return 200, 'OK'
+
+
+class GdpRequestHandler(BaseHTTPRequestHandler):
+    simulator = None
+
+    def _respond(self):
+        simulator = self.simulator
+        url = urlparse(self.path)
+        command = url.path.strip('/')
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8') if length else ''
+
+        # Injected latency and faults
+        delay = simulator.latency + simulator.random.uniform(0, simulator.jitter)
+        roll = simulator.random.random()
+        if roll < simulator.timeout_rate:
+            delay += simulator.timeout_delay
+        time.sleep(delay)
+        if simulator.timeout_rate <= roll < simulator.timeout_rate + simulator.error_rate:
+            status, text = 500, 'Injected error'
+        else:
+            status, text = simulator.handle(command, query, body)
+
+        payload = text.encode('utf-8')
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json' if text.startswith('{') else 'text/plain')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client gave up (e.g. its timeout expired)
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        self._respond()
+
+    def log_message(self, format, *args):
+        logging.debug("GDP simulator: " + format % args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local GDP stand-in server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unique-key", default=None, help="Reject requests with another UniqueKey")
+    parser.add_argument("--latency", type=float, default=0.0, help="Base response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Fraction of requests that stall")
+    parser.add_argument("--timeout-delay", type=float, default=30.0, help="How long stalled requests hang")
+    parser.add_argument("--script", default=None, help="JSON file with timed parameter changes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    script = None
+    if args.script:
+        with open(args.script, 'r') as f:
+            script = json.load(f)
+
+    simulator = GdpSimulator(host=args.host, port=args.port, unique_key=args.unique_key, latency=args.latency,
+                             jitter=args.jitter, error_rate=args.error_rate, timeout_rate=args.timeout_rate,
+                             timeout_delay=args.timeout_delay, script=script)
+    simulator.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
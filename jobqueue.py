@@ -0,0 +1,148 @@
+# jobqueue.py
+
+import os
+import sys
+import time
+import queue
+import itertools
+import threading
+import logging
+from eventbus import RESULT
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# Lower values run first; jobs of equal priority run in submission order
+PRIORITY_MANUAL = 0  # Transcribe button
+PRIORITY_AUTO = 10   # Enqueued when a recording stops
+
+STATUS_ICONS = {QUEUED: "⏳", RUNNING: "⚙️", DONE: "✅", FAILED: "❌"}
+
+
+class AnalysisJob:
+    """
+    One recording to transcribe and analyze. `settings` is a snapshot of the
+    analysis options taken when the job is submitted, so changing the UI
+    while it waits doesn't change what it computes.
+    """
+    def __init__(self, audio_path, settings, priority):
+        self.audio_path = audio_path
+        self.settings = dict(settings)
+        self.priority = priority
+        self.status = QUEUED
+        self.sequence = None  # Queue entry currently standing for this job
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.error = None
+
+    @property
+    def recording_folder(self):
+        return os.path.dirname(self.audio_path)
+
+
+def lower_thread_priority(niceness):
+    """
+    Raise the nice value of the calling thread only, so analysis yields the
+    CPU to audio capture. Linux schedules threads individually; elsewhere
+    this would renice the whole process, capture included, so it is skipped.
+    """
+    if not sys.platform.startswith('linux'):
+        logging.debug("Per-thread priority is only supported on Linux, analysis runs at normal priority.")
+        return
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), niceness)
+        logging.debug(f"Analysis worker niceness set to {niceness}.")
+    except OSError as e:
+        logging.warning(f"Could not lower the analysis worker priority: {e}")
+
+
+def format_job(job):
+    """One-line rendering of a job for the Jobs tab."""
+    queued_at = time.strftime('%H:%M:%S', time.localtime(job.submitted))
+    line = f"{STATUS_ICONS[job.status]} {job.recording_folder}  {job.status}  (queued {queued_at}"
+    if job.finished is not None:
+        line += f", took {job.finished - job.started:.0f}s"
+    elif job.started is not None:
+        line += f", running for {time.time() - job.started:.0f}s"
+    line += ")"
+    if job.error:
+        line += f"  {job.error}"
+    return line
+
+
+class JobQueue:
+    """
+    Runs analysis jobs one at a time on a background worker thread, in
+    priority order. The worker lowers its own scheduling priority (and that
+    of the model threads it starts), so a recording in progress keeps the
+    CPU. Status changes are published on the event bus as RESULT events
+    named 'job'.
+    """
+    def __init__(self, run_job, event_bus=None, niceness=10):
+        self.run_job = run_job
+        self.event_bus = event_bus
+        self.niceness = niceness
+        self.jobs = []  # Every submitted job, oldest first
+        self.lock = threading.Lock()
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self.worker = threading.Thread(target=self._work, name="analysis-worker", daemon=True)
+        self.worker.start()
+
+    def submit(self, audio_path, settings, priority=PRIORITY_AUTO):
+        """
+        Queue a recording for analysis. A recording that is already waiting
+        is not queued twice: it takes the new settings, and moves up if the
+        new request has a higher priority.
+        """
+        with self.lock:
+            job = next((job for job in self.jobs if job.audio_path == audio_path and job.status == QUEUED), None)
+            if job is None:
+                job = AnalysisJob(audio_path, settings, priority)
+                self.jobs.append(job)
+            else:
+                job.settings = dict(settings)
+                job.priority = min(job.priority, priority)
+            # Older entries for the same job are skipped by the worker
+            job.sequence = next(self._sequence)
+            self._queue.put((job.priority, job.sequence, job))
+        logging.info(f"Analysis of {audio_path} queued with priority {job.priority}.")
+        self._publish(job)
+        return job
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.jobs)
+
+    def pending(self):
+        with self.lock:
+            return sum(job.status in (QUEUED, RUNNING) for job in self.jobs)
+
+    def _publish(self, job):
+        if self.event_bus is not None:
+            self.event_bus.publish(RESULT, name='job', folder=job.recording_folder, status=job.status)
+
+    def _work(self):
+        lower_thread_priority(self.niceness)
+        while True:
+            _, sequence, job = self._queue.get()
+            with self.lock:
+                if job.status != QUEUED or job.sequence != sequence:
+                    continue
+                job.status = RUNNING
+                job.started = time.time()
+            self._publish(job)
+            try:
+                self.run_job(job)
+                job.status = DONE
+            except Exception as e:
+                job.status = FAILED
+                job.error = str(e)
+                logging.error(f"Analysis of {job.audio_path} failed: {e}")
+            job.finished = time.time()
+            logging.info(f"Analysis of {job.audio_path} {job.status} in {job.finished - job.started:.1f}s.")
+            self._publish(job)
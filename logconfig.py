@@ -0,0 +1,102 @@
+# logconfig.py
+
+import os
+import sys
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+
+# Per-subsystem levels. The GDP poller logs full response bodies at DEBUG,
+# so it stays at INFO unless asked for, e.g. SPEECHNR_LOG_LEVELS="gdp=DEBUG".
+DEFAULT_LEVELS = {
+    'gdp': logging.INFO,
+    'audio': logging.INFO,
+}
+
+_listener = None
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Hand records to the queue without formatting them. Messages are
+    rendered by the background listener instead of the logging thread;
+    only exception tracebacks, which can't outlive the call, are captured here.
+    """
+    def prepare(self, record):
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class LazyPayload:
+    """
+    Wrap a large payload (or a callable producing it) passed as a logging
+    argument. It is only turned into text if the record is emitted, and is
+    truncated to `limit` characters.
+    """
+    def __init__(self, payload, limit=500):
+        self.payload = payload
+        self.limit = limit
+
+    def __str__(self):
+        text = str(self.payload() if callable(self.payload) else self.payload)
+        if len(text) > self.limit:
+            return f"{text[:self.limit]}... ({len(text)} chars)"
+        return text
+
+
+def parse_levels(spec):
+    """
+    Parse 'gdp=DEBUG,audio=WARNING' into {'gdp': 10, 'audio': 30}.
+    Entries with an unknown level are skipped with a warning.
+    """
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, level = item.partition('=')
+        # getLevelName returns the string 'Level X' for names it doesn't know
+        value = logging.getLevelName(level.strip().upper())
+        if not name.strip() or not isinstance(value, int):
+            logging.getLogger(__name__).warning(f"Ignoring invalid log level setting '{item}'.")
+            continue
+        levels[name.strip()] = value
+    return levels
+
+
+def setup_logging(log_file='app_debug.log', max_bytes=5 * 1024 * 1024, backup_count=5,
+                  level=logging.DEBUG, console_level=logging.INFO, levels=None):
+    """
+    Route every record through a queue to a background thread that writes
+    a size-rotated log file and the console, so callers never block on I/O.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    file_handler.setFormatter(formatter)
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(console_level)
+    console_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(DeferredQueueHandler(log_queue))
+    root.setLevel(level)
+
+    subsystem_levels = dict(DEFAULT_LEVELS)
+    subsystem_levels.update(levels or {})
+    subsystem_levels.update(parse_levels(os.environ.get('SPEECHNR_LOG_LEVELS', '')))
+    for name, subsystem_level in subsystem_levels.items():
+        logging.getLogger(name).setLevel(subsystem_level)
+
+    _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
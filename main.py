@@ -1,46 +1,70 @@
-import sys
 import os
 import threading
 import time
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 import customtkinter as ctk
 import sounddevice as sd
 import numpy as np
 import wave
 import matplotlib
+import matplotlib.dates as mdates
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from transcription import transcribe_and_diarize
+from transcription import transcribe_and_diarize, transcribe_chunk, load_whisper_model, format_transcript
 from topicrelevance import TopicRelevanceAndClusteringApp
 from GdpHttpClient import GdpHttpClient
+from artifacts import ArtifactStore
+from crosssession import CrossSessionClusterModel
+from searchindex import SegmentIndex, segments_from_data, recording_key
+from archive import save_archive
+from speakerdb import SpeakerDatabase
+from playback import SegmentPlayer, build_segment_index
+from eventbus import EventBus, MESSAGE, PROGRESS, RESULT, format_event
+from jobqueue import JobQueue, PRIORITY_AUTO, PRIORITY_MANUAL, format_job
+from capturemetrics import CaptureMetrics, METER_FLOOR_DB
+from catalog import Catalog, ANALYZED, FAILED, format_recording, find_audio
+from ringbuffer import AudioRingBuffer
+from resultsio import results_path, save_analysis_results, load_analysis_results, read_metadata, result_columns
 import pandas as pd
 import logging
 from PIL import Image, ImageTk  # For Logo icons
 import tkinter as tk
-from tkinter import ttk, messagebox  # Use standard messagebox as fallback
+from tkinter import ttk, filedialog
 import queue
-import pygame  # For audio playback
-import logging
+import pygame  # For cue sounds
+from logconfig import setup_logging, LazyPayload
 
-logging.basicConfig(filename='app_debug.log', level=logging.DEBUG,
-                    format='%(asctime)s - %(levelname)s - %(message)s')
+# Logging goes through a queue to a background writer (rotating app_debug.log + console)
+setup_logging()
+gdp_log = logging.getLogger("gdp")  # GDP commands and parameter polling
+audio_log = logging.getLogger("audio")  # Capture and saving of recordings
 
 logging.info("Application started")
 
 
 matplotlib.use('TkAgg')  # Use TkAgg backend for matplotlib
 
-# Initialize pygame mixer for audio playback
+# Initialize pygame mixer for the start/stop cue sounds
 pygame.mixer.init()
 
+# Sentence models offered in the UI, by display name
+SENTENCE_MODELS = {
+    'paraphrase-MiniLM-L12-v2': 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2',
+    'paraphrase-mpnet-base-v2': 'sentence-transformers/paraphrase-multilingual-mpnet-base-v2',
+    'all-mpnet-base-v2': 'sentence-transformers/all-mpnet-base-v2',
+    'LaBSE': 'sentence-transformers/LaBSE',
+}
+
+LIVE_CHUNK_SECONDS = 15  # Audio transcribed at a time for live relevance
+GDP_TIMEOUT_SECONDS = 10  # Keeps a stalled GDP from blocking the poller past the recording
+LIVE_WHISPER_MODEL = 'base'  # Small enough to keep up with capture
+CAPTURE_RING_SECONDS = 60  # Audio kept in the shared capture ring for live consumers
+
 class MainApplication(ctk.CTk):
     def __init__(self):
         super().__init__()
 
-        # Initialize logging
-        self.init_logging()
-
         self.title("Synchronizer 🎛")
         self.geometry("1200x900")  # Increased height to accommodate new widgets
 
@@ -55,6 +79,12 @@ class MainApplication(ctk.CTk):
         self.PORT = ''
         self.UNIQUE_KEY = '12345abcde'
         self.num_speakers = ctk.IntVar(value=2)
+        self.cross_session_clusters = ctk.IntVar(value=0)  # Cluster against all past sessions
+        self.archive_audio = ctk.IntVar(value=0)  # Save recordings as lossless FLAC instead of WAV
+        self.live_relevance = ctk.IntVar(value=0)  # Score topics while recording
+        self.diarization_mode = ctk.StringVar(value="segment")  # How speaker embeddings are computed
+        self.capture_channels = ctk.StringVar(value="1")  # One channel per lavalier mic
+        self.auto_analyze = ctk.IntVar(value=1)  # Queue each recording for analysis when it stops
         self.topics = []
         self.selected_models = []
         self.audio_data = None
@@ -69,23 +99,24 @@ class MainApplication(ctk.CTk):
         self.wifi_icon_label = None  # Initialize wifi_icon_label
         self.logo_photo = None  # Initialize logo_photo
         self.audio_file_path = None  # Path to the recorded audio
+        self.audio_start_time = None  # Start time of the recording at audio_file_path
+        self.capture_metrics = None  # Health of the current (or last) capture
+        self.overflow_reported = False  # Overflow warning already shown for this recording
+        self.event_bus = EventBus()  # Progress and notifications from worker threads
+        self.toast_job = None  # Pending after() that clears the toast
 
         # Initialize UI components
         self.initUI()
 
-    def init_logging(self):
-        # Configure the root logger
-        self.logger = logging.getLogger()
-        self.logger.setLevel(logging.DEBUG)  # Capture all levels of logs
+        # Recordings are analyzed one at a time in the background, below capture priority
+        self.job_queue = JobQueue(self.run_analysis_job, event_bus=self.event_bus)
 
-        # Create a logging format
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        # Index of every recording under trials/, brought up to date in the background
+        self.catalog = Catalog()
+        threading.Thread(target=self.scan_catalog, daemon=True).start()
 
-        # Create console handler and set level to debug
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.DEBUG)
-        console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+        # Drain worker events on the Tk main loop
+        self.after(100, self.process_events)
 
     def initUI(self):
         # Create a main frame
@@ -186,7 +217,7 @@ class MainApplication(ctk.CTk):
         self.models_listbox.configure(width=250, height=120)  # Resize to fit the model checkboxes better
 
         self.model_vars = []
-        models = ['paraphrase-MiniLM-L12-v2', 'paraphrase-mpnet-base-v2', 'all-mpnet-base-v2', 'LaBSE']
+        models = list(SENTENCE_MODELS)
         for idx, model in enumerate(models):
             var = ctk.IntVar(value=0)
             checkbox = ctk.CTkCheckBox(self.models_listbox, text=model, variable=var, font=("Helvetica", 12))
@@ -201,6 +232,33 @@ class MainApplication(ctk.CTk):
 
         self.transcribe_button = ctk.CTkButton(main_frame, text="Transcribe and Diarize 📝🔊", command=self.transcribe_and_analyze, state="disabled", font=("Helvetica", 12))
         self.parameters_button = ctk.CTkButton(main_frame, text="Show Parameters 📊", command=self.show_parameters, font=("Helvetica", 12))
+        self.load_analysis_button = ctk.CTkButton(main_frame, text="Load Analysis 📂", command=self.load_analysis, font=("Helvetica", 12))
+
+        # Analysis options
+        self.options_frame = ctk.CTkFrame(main_frame)
+        self.options_frame.grid(row=5, column=0, columnspan=6, sticky="ew", padx=5, pady=5)
+
+        self.cross_session_checkbox = ctk.CTkCheckBox(self.options_frame, text="Cross-session clusters", variable=self.cross_session_clusters, font=("Helvetica", 12))
+        self.cross_session_checkbox.pack(side="left", padx=10, pady=5)
+
+        self.archive_checkbox = ctk.CTkCheckBox(self.options_frame, text="Archive as FLAC", variable=self.archive_audio, font=("Helvetica", 12))
+        self.archive_checkbox.pack(side="left", padx=10, pady=5)
+
+        self.live_relevance_checkbox = ctk.CTkCheckBox(self.options_frame, text="Live relevance", variable=self.live_relevance, font=("Helvetica", 12))
+        self.live_relevance_checkbox.pack(side="left", padx=10, pady=5)
+
+        self.auto_analyze_checkbox = ctk.CTkCheckBox(self.options_frame, text="Analyze after recording", variable=self.auto_analyze, font=("Helvetica", 12))
+        self.auto_analyze_checkbox.pack(side="left", padx=10, pady=5)
+
+        diarization_label = ctk.CTkLabel(self.options_frame, text="Diarization:", font=("Helvetica", 12))
+        diarization_label.pack(side="left", padx=(20, 5), pady=5)
+        self.diarization_menu = ctk.CTkOptionMenu(self.options_frame, values=["segment", "windowed", "channel"], variable=self.diarization_mode, font=("Helvetica", 12))
+        self.diarization_menu.pack(side="left", padx=5, pady=5)
+
+        channels_label = ctk.CTkLabel(self.options_frame, text="Channels:", font=("Helvetica", 12))
+        channels_label.pack(side="left", padx=(20, 5), pady=5)
+        self.channels_menu = ctk.CTkOptionMenu(self.options_frame, values=["1", "2", "3", "4"], variable=self.capture_channels, width=60, font=("Helvetica", 12))
+        self.channels_menu.pack(side="left", padx=5, pady=5)
 
         # Audio player controls
         self.audio_player_frame = ctk.CTkFrame(main_frame)
@@ -216,6 +274,24 @@ class MainApplication(ctk.CTk):
         self.pause_button.pack(side="left", padx=10, pady=10)
         self.stop_button.pack(side="left", padx=10, pady=10)
 
+        # Input level and capture health while recording
+        level_label = ctk.CTkLabel(self.audio_player_frame, text="Level 🎚️", font=("Helvetica", 12))
+        level_label.pack(side="left", padx=(20, 5), pady=10)
+        self.level_meter = ctk.CTkProgressBar(self.audio_player_frame, width=120)
+        self.level_meter.set(0)
+        self.level_meter.pack(side="left", padx=5, pady=10)
+        self.capture_health_label = ctk.CTkLabel(self.audio_player_frame, text="", font=("Helvetica", 12))
+        self.capture_health_label.pack(side="left", padx=5, pady=10)
+
+        # Progress of background work and short-lived notifications
+        self.toast_label = ctk.CTkLabel(self.audio_player_frame, text="", font=("Helvetica", 12))
+        self.toast_label.pack(side="right", padx=10, pady=10)
+        self.progress_bar = ctk.CTkProgressBar(self.audio_player_frame, width=200)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(side="right", padx=10, pady=10)
+        self.progress_label = ctk.CTkLabel(self.audio_player_frame, text="Idle", font=("Helvetica", 12))
+        self.progress_label.pack(side="right", padx=5, pady=10)
+
         # One set of tabs for Transcription, Parameters, Cluster Plot, and Relevance Plot
         notebook = ttk.Notebook(main_frame)
         notebook.grid(row=7, column=0, columnspan=6, sticky="nsew", padx=5, pady=5)
@@ -225,12 +301,18 @@ class MainApplication(ctk.CTk):
         parameters_tab = tk.Frame(notebook)
         cluster_tab = tk.Frame(notebook)
         relevance_tab = tk.Frame(notebook)
+        log_tab = tk.Frame(notebook)
+        jobs_tab = tk.Frame(notebook)
+        recordings_tab = tk.Frame(notebook)
 
         # Add tabs to the notebook
         notebook.add(transcription_tab, text="Transcription 📝")
         notebook.add(parameters_tab, text="Collected Parameters 📋")
         notebook.add(cluster_tab, text="Cluster Plot 📈")
         notebook.add(relevance_tab, text="Relevance Plot 🔍")
+        notebook.add(log_tab, text="Log 🧾")
+        notebook.add(jobs_tab, text="Jobs ⚙️")
+        notebook.add(recordings_tab, text="Recordings 🗂️")
 
         # Transcription textbox in the Transcription tab
         self.transcription_text = ctk.CTkTextbox(transcription_tab, height=200, font=("Helvetica", 12))
@@ -251,6 +333,20 @@ class MainApplication(ctk.CTk):
         self.relevance_canvas = FigureCanvasTkAgg(self.relevance_fig, master=relevance_tab)
         self.relevance_canvas.draw()
         self.relevance_canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.relevance_canvas.mpl_connect('button_press_event', self.on_relevance_click)
+        self.relevance_points = None  # (plot x values, segment start seconds) of the plotted transcript
+
+        # Event log in the Log tab
+        self.log_text = ctk.CTkTextbox(log_tab, height=200, font=("Helvetica", 12))
+        self.log_text.pack(fill="both", expand=True)
+
+        # Analysis queue in the Jobs tab
+        self.jobs_text = ctk.CTkTextbox(jobs_tab, height=200, font=("Helvetica", 12))
+        self.jobs_text.pack(fill="both", expand=True)
+
+        # Catalog of past recordings in the Recordings tab
+        self.recordings_text = ctk.CTkTextbox(recordings_tab, height=200, font=("Helvetica", 12))
+        self.recordings_text.pack(fill="both", expand=True)
 
         # Configure and add logging to the console only
         logging.info("UI initialized successfully.")
@@ -270,38 +366,72 @@ class MainApplication(ctk.CTk):
         self.stop_recording_button.grid(row=4, column=1, padx=5, pady=20, sticky="ew")
         self.transcribe_button.grid(row=4, column=2, padx=5, pady=20, sticky="ew")
         self.parameters_button.grid(row=4, column=3, padx=5, pady=20, sticky="ew")
+        self.load_analysis_button.grid(row=4, column=4, padx=5, pady=20, sticky="ew")
 
-        # Initialize pygame mixer for audio playback controls
-        self.is_paused = False
+        # Player for the current recording, created on first use
+        self.player = None
 
-    def play_audio(self):
-        if self.audio_file_path and os.path.exists(self.audio_file_path):
-            try:
-                pygame.mixer.music.load(self.audio_file_path)
-                pygame.mixer.music.play()
-                logging.info(f"Playing audio: {self.audio_file_path}")
-            except Exception as e:
-                logging.error(f"Error playing audio: {e}")
-                self.show_message("Playback Error", f"Error playing audio: {e}", "error")
-        else:
-            self.show_message("No Audio", "No audio file available to play.", "warning")
-            logging.warning("Play audio attempted without an available audio file.")
+    def get_player(self):
+        """Return a SegmentPlayer for the current recording, or None if there is none."""
+        if not self.audio_file_path or not os.path.exists(self.audio_file_path):
+            return None
+        if self.player is None or self.player.audio_path != self.audio_file_path:
+            self.reset_player()
+            self.player = SegmentPlayer(self.audio_file_path)
+        return self.player
+
+    def reset_player(self):
+        if self.player is not None:
+            self.player.close()
+            self.player = None
+
+    def play_audio(self, seconds=None):
+        """Play from `seconds`, or resume a paused playback (from the start otherwise) when not given."""
+        try:
+            player = self.get_player()
+            if player is None:
+                self.show_message("No Audio", "No audio file available to play.", "warning")
+                logging.warning("Play audio attempted without an available audio file.")
+                return
+            if seconds is None and player.paused:
+                player.resume()
+                logging.info(f"Resumed audio: {self.audio_file_path}")
+                return
+            seconds = seconds or 0.0
+            player.play_from(seconds)
+            logging.info(f"Playing audio: {self.audio_file_path} from {seconds:.1f}s")
+        except Exception as e:
+            logging.error(f"Error playing audio: {e}")
+            self.show_message("Playback Error", f"Error playing audio: {e}", "error")
 
-    def pause_audio(self):
-        if pygame.mixer.music.get_busy():
-            if not self.is_paused:
-                pygame.mixer.music.pause()
-                self.is_paused = True
-                logging.info("Audio playback paused.")
+    def play_segment(self, index):
+        """Start playback at a transcript segment using the precomputed offset index."""
+        try:
+            player = self.get_player()
+            if player is None:
+                return
+            if player.segment_offsets is not None and index < len(player.segment_offsets):
+                player.play_segment(index)
             else:
-                pygame.mixer.music.unpause()
-                self.is_paused = False
-                logging.info("Audio playback resumed.")
+                player.play_from(self.transcription[index]['start'])
+            logging.info(f"Playing segment {index} of {self.audio_file_path}")
+        except Exception as e:
+            logging.error(f"Error playing segment {index}: {e}")
+            self.show_message("Playback Error", f"Error playing segment: {e}", "error")
+
+    def pause_audio(self):
+        if self.player is None:
+            return
+        if self.player.busy:
+            self.player.pause()
+            logging.info("Audio playback paused.")
+        elif self.player.paused:
+            self.player.resume()
+            logging.info("Audio playback resumed.")
 
     def stop_audio(self):
-        if pygame.mixer.music.get_busy():
-            pygame.mixer.music.stop()
-            self.is_paused = False
+        if self.player is not None:
+            self.player.stop()
             logging.info("Audio playback stopped.")
 
     def play_sound(self, sound_file):
@@ -339,12 +469,12 @@ class MainApplication(ctk.CTk):
         cmd = client.make_Command('GetStimulationStatus')
         try:
             response = cmd.Send()
-            logging.debug(f"GDP Response: {response.status_code} - {response.text}")
+            gdp_log.debug("GDP Response: %s - %s", response.status_code, LazyPayload(response.text))
             if response.status_code == 200:
                 self.connected = True
                 logging.info("Connection to the server established successfully.")
                 self.show_wifi_icon()
-                self.connection_status_label.configure(text="🟢")  # Green circle for connected
+                self.after(0, lambda: self.connection_status_label.configure(text="🟢"))  # Green circle for connected
                 # Enable other buttons in the main thread
                 self.after(0, lambda: self.start_recording_button.configure(state="normal"))
                 self.after(0, lambda: self.transcribe_button.configure(state="normal"))
@@ -353,13 +483,13 @@ class MainApplication(ctk.CTk):
                 self.connected = False
                 logging.warning(f"Failed to connect to the server. Status Code: {response.status_code}")
                 self.hide_wifi_icon()
-                self.connection_status_label.configure(text="🔴")  # Red circle for disconnected
+                self.after(0, lambda: self.connection_status_label.configure(text="🔴"))  # Red circle for disconnected
                 self.show_message("Connection Failed", "Failed to connect to the server. ❌", "warning")
         except Exception as e:
             self.connected = False
             logging.error(f"Connection error: {e}")
             self.hide_wifi_icon()
-            self.connection_status_label.configure(text="🔴")  # Red circle for disconnected
+            self.after(0, lambda: self.connection_status_label.configure(text="🔴"))  # Red circle for disconnected
             self.show_message("Connection Error", f"Error: {str(e)} ⚠️", "error")
 
     def show_wifi_icon(self):
@@ -376,9 +506,19 @@ class MainApplication(ctk.CTk):
 
     def start_recording_thread(self):
         """Start the recording in a separate thread to prevent GUI blocking."""
-        threading.Thread(target=self.start_recording, daemon=True).start()
-
-    def start_recording(self):
+        threading.Thread(target=self.start_recording, args=(self.recording_options(),), daemon=True).start()
+
+    def recording_options(self):
+        """Snapshot of the recording options, taken on the main thread when Start is pressed."""
+        return {
+            'channels': int(self.capture_channels.get()),
+            'live_relevance': self.live_relevance.get() == 1,
+            'topics': [topic.strip() for topic in self.topics_input.get().split(',') if topic.strip()],
+            'models': [model for var, model in self.model_vars if var.get() == 1],
+            'archive_audio': self.archive_audio.get() == 1,
+        }
+
+    def start_recording(self, options):
         logging.info("Start Recording button pressed.")
         # Removed the connection check to allow recording without server connection
 
@@ -392,16 +532,23 @@ class MainApplication(ctk.CTk):
         else:
             logging.info("Not connected to server. Skipping GDP command sending.")
 
-        self.stop_event.clear()
+        # A fresh event per recording, so a previous capture still saving isn't resumed
+        self.stop_event = threading.Event()
+        # Stimulation parameter snapshots of this recording only, filled by its poller
+        parameters = []
         if not self.recording:
-            self.recording_thread = threading.Thread(target=self.record_audio, daemon=True)
+            # Capture fans out through a shared ring; consumers join before the first block
+            ring = AudioRingBuffer(44100 * CAPTURE_RING_SECONDS, options['channels'])
+            live_consumer = ring.add_consumer("live relevance") if options['live_relevance'] else None
+
+            self.recording_thread = threading.Thread(target=self.record_audio,
+                                                     args=(ring, parameters, options['archive_audio']), daemon=True)
             self.recording_thread.start()
             self.recording = True
 
             # Update button states in the main thread
             self.after(0, lambda: self.start_recording_button.configure(state="disabled"))
             self.after(0, lambda: self.stop_recording_button.configure(state="normal"))
-            self.after(0, lambda: self.transcribe_button.configure(state="disabled"))
 
             logging.debug("Recording thread started.")
 
@@ -410,10 +557,18 @@ class MainApplication(ctk.CTk):
 
             # Show recording indicator
             self.after(0, lambda: self.recording_status_label.configure(text="🔴 Recording... 🎤"))
+            self.overflow_reported = False
+            self.after(100, self.update_capture_meter)
+
+            # Score topic relevance while recording if requested
+            if live_consumer is not None:
+                threading.Thread(target=self.live_relevance_loop, args=(live_consumer, options['topics'], options['models']),
+                                 daemon=True).start()
+                logging.debug("Live relevance thread started.")
 
             # Start periodic requests in a separate thread only if connected
             if self.connected:
-                threading.Thread(target=self.periodic_request, daemon=True).start()
+                threading.Thread(target=self.periodic_request, args=(self.stop_event, parameters), daemon=True).start()
                 logging.debug("Periodic request thread started.")
             else:
                 logging.info("Not connected. Skipping periodic requests.")
@@ -448,108 +603,152 @@ class MainApplication(ctk.CTk):
 
         # Enable audio player buttons
         self.after(0, lambda: self.play_button.configure(state="normal"))
+        self.after(0, lambda: self.pause_button.configure(state="normal"))
         self.after(0, lambda: self.stop_button.configure(state="normal"))
 
-    def record_audio(self):
+    def record_audio(self, ring, parameters, archive_audio):
         fs = 44100  # Sample rate
-        channels = 1  # Mono
-        self.audio_frames = []
+        channels = ring.channels  # Interleaved, one per mic
+        # The next recording may start while this one is still being saved
+        stop_event = self.stop_event
+        start_time = self.start_time
+        audio_frames = []
+        self.capture_metrics = metrics = CaptureMetrics(fs, block_size=1024)
 
         try:
-            logging.debug("Audio recording started.")
+            audio_log.debug(f"Audio recording started ({channels} channels).")
             with sd.InputStream(samplerate=fs, channels=channels) as stream:
-                while not self.stop_event.is_set():
-                    data, _ = stream.read(1024)
-                    self.audio_frames.append(data.copy())
+                while not stop_event.is_set():
+                    # Frames already waiting show how far behind the loop is
+                    available = stream.read_available
+                    read_start = time.perf_counter()
+                    data, overflowed = stream.read(1024)
+                    metrics.record_read(time.perf_counter() - read_start, overflowed, available, data)
+                    # stream.read() returns a fresh array, so it is kept as is
+                    audio_frames.append(data)
+                    for slot in ring.write(data):
+                        audio_log.warning(f"Capture consumer in ring slot {slot} is a full buffer behind, its frames are being dropped.")
+
+            if metrics.overflows:
+                audio_log.warning(f"Input overflowed {metrics.overflows} times, audio was dropped from this recording.")
 
             # Concatenate all recorded frames
-            audio_data = np.concatenate(self.audio_frames, axis=0)
+            audio_data = np.concatenate(audio_frames, axis=0)
 
             # Save audio to file
-            audio_file_path = self.save_audio_file(audio_data, fs)
+            audio_file_path = self.save_audio_file(audio_data, fs, start_time, parameters, archive_audio)
             self.audio_file_path = audio_file_path  # Save path for later use
-            logging.info(f"Audio recording saved to {self.audio_file_path}")
+            self.audio_start_time = start_time
+            audio_log.info(f"Audio recording saved to {audio_file_path}")
+
+            # Keep the capture health next to the recording
+            if audio_file_path:
+                try:
+                    metrics.save(os.path.dirname(audio_file_path))
+                except Exception as e:
+                    audio_log.error(f"Failed to save capture metrics: {e}")
+                self.update_catalog(os.path.dirname(audio_file_path))
 
             # Notify user that audio has been saved
-            self.after(0, lambda: self.show_message("Audio Saved", "🎉 Audio saved successfully!", "info"))
+            self.show_message("Audio Saved", "🎉 Audio saved successfully!", "info")
+
+            # The main loop queues it for analysis while the next trial records
+            if audio_file_path:
+                self.event_bus.publish(RESULT, name='recording', audio_path=audio_file_path, start_time=start_time)
 
         except Exception as e:
-            logging.error(f"An error occurred during recording: {e}")
+            audio_log.error(f"An error occurred during recording: {e}")
             self.show_message("Recording Error", f"An error occurred during recording: {e} ⚠️", "error")
+        finally:
+            # Consumers still reading keep the ring alive until they take their last frames
+            ring.close()
+
+    def update_capture_meter(self):
+        """Refresh the level meter and capture health indicator while recording."""
+        metrics = self.capture_metrics
+        if metrics is not None:
+            _, peak_db = metrics.level()
+            self.level_meter.set(min(max(1 - peak_db / METER_FLOOR_DB, 0), 1))
+            warning = metrics.warning
+            self.capture_health_label.configure(text=f"⚠️ {warning}" if warning else "🟢 Capture OK")
+            if metrics.overflows and not self.overflow_reported:
+                self.overflow_reported = True
+                self.show_message("Capture Overflow", "Audio input overflowed, part of this recording was dropped. ⚠️", "warning")
+        if self.recording:
+            self.after(100, self.update_capture_meter)
+        else:
+            self.level_meter.set(0)
 
-    def save_audio_file(self, audio_data, fs):
-        logging.debug("Saving recording...")
+    def save_audio_file(self, audio_data, fs, start_time=None, parameters=None, archive_audio=False):
+        audio_log.debug("Saving recording...")
+        start_time = start_time or self.start_time
         try:
             # Create directory structure: trials/sess_DDMMYY/rec_HHMMSS/
             base_dir = "trials"
-            session_date = self.start_time.strftime("%d%m%y")  # Format: DDMMYY
-            recording_time = self.start_time.strftime("%H%M%S")  # Format: HHMMSS
+            session_date = start_time.strftime("%d%m%y")  # Format: DDMMYY
+            recording_time = start_time.strftime("%H%M%S")  # Format: HHMMSS
 
             session_folder = os.path.join(base_dir, f"sess_{session_date}")
             recording_folder = os.path.join(session_folder, f"rec_{recording_time}")
 
             # Ensure the base directory exists
             os.makedirs(recording_folder, exist_ok=True)
-            logging.debug(f"Saving files to: {recording_folder}")
+            audio_log.debug(f"Saving files to: {recording_folder}")
 
             # Save the audio file to the recording_folder
-            audio_file_path = os.path.join(recording_folder, "audio.wav")
-            with wave.open(audio_file_path, 'wb') as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)  # 16-bit audio
-                wf.setframerate(fs)
-                wf.writeframes((audio_data * 32767).astype(np.int16).tobytes())
+            samples = (audio_data * 32767).astype(np.int16)
+            if archive_audio:
+                # Lossless FLAC, decoded in blocks by playback and analysis
+                audio_file_path = os.path.join(recording_folder, "audio.flac")
+                save_archive(audio_file_path, samples, fs)
+            else:
+                audio_file_path = os.path.join(recording_folder, "audio.wav")
+                with wave.open(audio_file_path, 'wb') as wf:
+                    wf.setnchannels(samples.shape[1] if samples.ndim > 1 else 1)
+                    wf.setsampwidth(2)  # 16-bit audio
+                    wf.setframerate(fs)
+                    wf.writeframes(samples.tobytes())
 
             # Save the session-specific parameters to params.json
             params_file_path = os.path.join(recording_folder, "params.json")
 
             if self.connected:
-                # Copy the small_parameters_data.json to params.json only if it's not empty
-                SMALL_JSON_FILE_PATH = 'small_parameters_data.json'
-                if os.path.exists(SMALL_JSON_FILE_PATH):
-                    with open(SMALL_JSON_FILE_PATH, 'r') as src:
-                        try:
-                            json_data = json.load(src)
-                        except json.JSONDecodeError:
-                            json_data = []
-                        if json_data:  # Ensure it's not empty before copying
-                            with open(params_file_path, 'w') as dst:
-                                json.dump(json_data, dst, indent=4)
-                            logging.info(f"Parameters file saved: {params_file_path}")
-
-                            # Clear the temporary parameters file after copying (only after successful save)
-                            with open(SMALL_JSON_FILE_PATH, 'w') as f:
-                                json.dump([], f)
-                            logging.debug("Temporary parameters file cleared.")
+                # Snapshots collected by this recording's poller only, not the next trial's
+                parameters = list(parameters or [])
+                if parameters:
+                    with open(params_file_path, 'w') as dst:
+                        json.dump(parameters, dst, indent=4)
+                    audio_log.info(f"Parameters file saved: {params_file_path}")
                 else:
-                    logging.warning(f"{SMALL_JSON_FILE_PATH} does not exist. Skipping parameter saving.")
+                    audio_log.warning("No stimulation parameters were collected. Skipping parameter saving.")
             else:
                 # If not connected, save an empty params.json
                 with open(params_file_path, 'w') as dst:
                     json.dump([], dst, indent=4)
-                logging.info(f"Saved empty parameters file: {params_file_path} (No server connection)")
+                audio_log.info(f"Saved empty parameters file: {params_file_path} (No server connection)")
 
             return audio_file_path
 
         except Exception as e:
-            logging.error(f"Error saving files: {e}")
+            audio_log.error(f"Error saving files: {e}")
             self.show_message("Save Error", f"An error occurred while saving files: {e} ⚠️", "error")
             return None
 
-    def send_gdp_command(self, command, name):
-        logging.info(f"Sending GDP command '{command}' with name '{name}'.")
-        client = GdpHttpClient(name=name, ip=self.IP, port_number=self.PORT, unique_key=self.UNIQUE_KEY)
+    def send_gdp_command(self, command, name, parameters_log=None):
+        gdp_log.info(f"Sending GDP command '{command}' with name '{name}'.")
+        client = GdpHttpClient(name=name, ip=self.IP, port_number=self.PORT, unique_key=self.UNIQUE_KEY,
+                               timeout=GDP_TIMEOUT_SECONDS)
         cmd = client.make_Command(command)
         try:
             response = cmd.Send()
-            logging.debug(f"GDP Response for '{command}': {response.status_code} - {response.text}")
+            gdp_log.debug("GDP Response for '%s': %s - %s", command, response.status_code, LazyPayload(response.text))
 
             if response.status_code == 200:
                 if command == 'GetStimulationParameters':
                     try:
                         parameters = json.loads(response.text)
                     except json.JSONDecodeError as e:
-                        logging.error(f"Failed to parse JSON response: {e}")
+                        gdp_log.error(f"Failed to parse JSON response: {e}")
                         parameters = {'error': f'Failed to parse response: {e}', 'raw_response': response.text}
 
                     timestamp = time.time()
@@ -569,30 +768,19 @@ class MainApplication(ctk.CTk):
                     with open(JSON_FILE_PATH, 'w') as f:
                         json.dump(data, f, indent=4)
 
-                    logging.info(f'Updated full parameters saved to {JSON_FILE_PATH}')
-
-                    # Also save this session's parameters to a smaller temporary file
-                    SMALL_JSON_FILE_PATH = 'small_parameters_data.json'
-                    try:
-                        with open(SMALL_JSON_FILE_PATH, 'r') as f:
-                            small_data = json.load(f)
-                    except (FileNotFoundError, json.JSONDecodeError):
-                        small_data = []
-
-                    small_data.append(new_data)
+                    gdp_log.info(f'Updated full parameters saved to {JSON_FILE_PATH}')
 
-                    with open(SMALL_JSON_FILE_PATH, 'w') as f:
-                        json.dump(small_data, f, indent=4)
-
-                    logging.info(f'Updated small parameters saved to {SMALL_JSON_FILE_PATH}')
+                    # Also keep it with the recording that requested it, saved to its params.json
+                    if parameters_log is not None:
+                        parameters_log.append(new_data)
 
                     # Update the Parameters tab progressively
                     self.after(0, lambda: self.append_parameters_to_textbox(new_data))
             else:
-                logging.warning(f"GDP command '{command}' failed with status code: {response.status_code}")
+                gdp_log.warning(f"GDP command '{command}' failed with status code: {response.status_code}")
                 self.show_message("Command Failed", f"Command '{command}' failed with status code: {response.status_code} ⚠️", "warning")
         except Exception as e:
-            logging.error(f"Failed to send command '{command}': {e}")
+            gdp_log.error(f"Failed to send command '{command}': {e}")
             self.show_message("Command Error", f"Failed to send command '{command}'. Error: {str(e)} ⚠️", "error")
 
     def append_parameters_to_textbox(self, new_data):
@@ -614,23 +802,97 @@ class MainApplication(ctk.CTk):
 
             self.parameters_text.insert(tk.END, param_str)
             self.parameters_text.see(tk.END)  # Scroll to the end
-            logging.debug(f"Appended new parameters to the textbox:\n{param_str}")
+            gdp_log.debug("Appended new parameters to the textbox:\n%s", param_str)
         else:
-            logging.warning('Parameters are None for one of the entries.')
+            gdp_log.warning('Parameters are None for one of the entries.')
 
-    def periodic_request(self):
-        logging.debug("Periodic request thread started.")
-        while not self.stop_event.is_set():
+    def periodic_request(self, stop_event, parameters):
+        # stop_event and parameters are this recording's own; the next recording gets fresh ones
+        gdp_log.debug("Periodic request thread started.")
+        while not stop_event.is_set():
             current_time = time.time()
             hhmmss = time.strftime("%H%M%S", time.localtime(current_time))
             name = f'duringRec{hhmmss}'
-            self.send_gdp_command('GetStimulationParameters', name)
+            self.send_gdp_command('GetStimulationParameters', name, parameters)
             for _ in range(30):
-                if self.stop_event.is_set():
-                    logging.debug("Stop event detected. Exiting periodic request thread.")
+                if stop_event.is_set():
+                    gdp_log.debug("Stop event detected. Exiting periodic request thread.")
                     return
                 time.sleep(1)
 
+    def live_relevance_loop(self, consumer, topics, model_names):
+        """
+        Transcribe the recording in chunks as it is captured and score each new
+        segment against the topics, appending points to the Relevance Plot.
+        """
+        try:
+            self.run_live_relevance(consumer, topics, model_names)
+        finally:
+            consumer.close()
+
+    def run_live_relevance(self, consumer, topics, model_names):
+        # Taken before the models load, in case the next recording starts meanwhile
+        start_time = self.start_time
+        stop_event = self.stop_event
+        if not topics or not model_names:
+            logging.warning("Live relevance needs at least one topic and one selected model.")
+            return
+
+        try:
+            whisper_model = load_whisper_model(LIVE_WHISPER_MODEL)
+            model_app = TopicRelevanceAndClusteringApp(model_name=SENTENCE_MODELS[model_names[0]])
+            model_app.start_live_relevance(topics)
+        except Exception as e:
+            logging.error(f"Failed to start live relevance: {e}")
+            return
+
+        fs = 44100
+        self.event_bus.publish(RESULT, name='live_relevance_start', topics=topics, model_name=model_names[0])
+        while True:
+            stopping = stop_event.wait(LIVE_CHUNK_SECONDS)
+            first_frame, views = consumer.read()
+            if views:
+                offset = first_frame / fs
+                # Whisper needs its own copy; take it before the ring comes around
+                chunk = np.concatenate(views, axis=0)
+                del views
+                if stopping:
+                    consumer.close()  # Capture can free the ring while the last chunk is transcribed
+                try:
+                    segments = transcribe_chunk(whisper_model, chunk, fs, offset)
+                    for segment in segments:
+                        segment_time = start_time + timedelta(seconds=segment['start'])
+                        _, rolling = model_app.score_live_segment(segment['text'], segment_time)
+                        self.event_bus.publish(RESULT, name='live_relevance', time=segment_time, scores=rolling)
+                except Exception as e:
+                    logging.error(f"Live relevance chunk failed: {e}")
+            if stopping:
+                logging.debug("Stop event detected. Exiting live relevance thread.")
+                return
+
+    def reset_live_relevance_plot(self, topics, model_name):
+        self.relevance_fig.clf()
+        self.relevance_points = None
+        ax = self.relevance_fig.add_subplot(111)
+        ax.xaxis_date()
+        self.live_lines = [(ax.plot([], [], label=topic)[0], [], []) for topic in topics]
+        ax.set_title(f"Live Topic Relevance - {model_name}")
+        ax.set_xlabel("Time")
+        ax.set_ylabel("Relevance Score (rolling)")
+        ax.legend()
+        self.live_ax = ax
+        self.relevance_canvas.draw_idle()
+
+    def append_live_relevance_point(self, segment_time, scores):
+        x = mdates.date2num(segment_time)
+        for (line, xs, ys), score in zip(self.live_lines, scores):
+            xs.append(x)
+            ys.append(float(score))
+            line.set_data(xs, ys)
+        self.live_ax.relim()
+        self.live_ax.autoscale_view()
+        self.relevance_canvas.draw_idle()
+
     def show_parameters(self):
         logging.info("Show Parameters button pressed.")
         # Since parameters are now displayed progressively, this can be used to refresh or handle any additional logic
@@ -663,12 +925,30 @@ class MainApplication(ctk.CTk):
                 })
 
                 flattened_data.append(data)
-                logging.debug(f"Flattened parameters: {data}")
+                gdp_log.debug("Flattened parameters: %s", LazyPayload(data))
             else:
-                logging.warning('Parameters are None for one of the entries.')
+                gdp_log.warning('Parameters are None for one of the entries.')
 
         return flattened_data
 
+    def analysis_settings(self, recording_start_time):
+        """Snapshot of the analysis options, taken on the main thread when a job is queued."""
+        return {
+            'topics': [topic.strip() for topic in self.topics_input.get().split(',') if topic.strip()],
+            'models': [model for var, model in self.model_vars if var.get() == 1],
+            'num_speakers': self.num_speakers.get(),
+            'diarization_mode': self.diarization_mode.get(),
+            'cross_session': self.cross_session_clusters.get() == 1,
+            'recording_start_time': recording_start_time,
+        }
+
+    def enqueue_analysis(self, audio_file_path, recording_start_time, priority):
+        settings = self.analysis_settings(recording_start_time)
+        if not settings['topics'] or not settings['models']:
+            logging.info(f"Not queueing {audio_file_path}: no topics or models selected.")
+            return None
+        return self.job_queue.submit(audio_file_path, settings, priority)
+
     def transcribe_and_analyze(self):
         logging.info("Transcribe and Diarize button pressed.")
         self.topics = [topic.strip() for topic in self.topics_input.get().split(',') if topic.strip()]
@@ -687,45 +967,61 @@ class MainApplication(ctk.CTk):
             logging.warning("Transcribe and analyze attempted without entering topics.")
             return
 
-        self.transcribe_button.configure(state="disabled")
-        logging.debug("Transcribe and analyze button disabled.")
-
-        # Perform transcription and diarization in a separate thread
-        threading.Thread(target=self.perform_transcription_and_analysis, daemon=True).start()
-
-    def perform_transcription_and_analysis(self):
-        logging.info("Starting transcription and diarization process.")
+        # Requested analyses run ahead of the ones queued automatically
+        self.enqueue_analysis(self.audio_file_path, self.audio_start_time or self.start_time, PRIORITY_MANUAL)
+        self.show_toast(f"Analysis queued ({self.job_queue.pending()} pending)")
+
+    def run_analysis_job(self, job):
+        """Transcribe and analyze one queued recording; runs on the job queue worker."""
+        audio_file_path = job.audio_path
+        settings = job.settings
+        recording_folder = job.recording_folder
+        recording_name = os.path.basename(recording_folder)
+        logging.info(f"Starting transcription and diarization of {audio_file_path}.")
+        self.event_bus.progress(f"{recording_name}: Transcribing and diarizing", 0.0)
         # Perform transcription and diarization
         try:
-            self.transcription, self.formatted_transcript = transcribe_and_diarize(
-                self.audio_file_path,
-                num_speakers=self.num_speakers.get(),
-                recording_start_time=self.start_time,
+            # Stage outputs are cached next to the recording, so re-runs only
+            # recompute the stages whose inputs changed.
+            artifact_store = ArtifactStore(audio_file_path)
+            transcription, _ = transcribe_and_diarize(
+                audio_file_path,
+                num_speakers=settings['num_speakers'],
+                recording_start_time=settings['recording_start_time'],
                 language='any',
-                model_size='medium'
+                model_size='medium',
+                artifact_store=artifact_store,
+                diarization_mode=settings['diarization_mode'],
+                speaker_db=SpeakerDatabase()  # Enrolled speakers, if any, are labeled by name
             )
             logging.info("Transcription and diarization completed successfully.")
-            self.show_message("Transcription Started", "🔄 Transcription and diarization started...", "info")
         except Exception as e:
             logging.error(f"An error occurred during transcription: {e}")
-            self.show_message("Transcription Error", f"An error occurred during transcription: {e} ⚠️", "error")
-            self.transcribe_button.configure(state="normal")
-            return
+            self.show_message("Transcription Error", f"An error occurred during transcription of {recording_name}: {e} ⚠️", "error")
+            self.event_bus.progress(f"{recording_name}: Transcription failed", 0.0)
+            self.update_catalog(recording_folder, FAILED, error=str(e))
+            raise
+
+        # Index segment start offsets so playback can seek straight to any segment
+        if transcription:
+            try:
+                build_segment_index(audio_file_path, [entry['start'] for entry in transcription])
+            except Exception as e:
+                logging.error(f"Failed to build the segment playback index: {e}")
 
-        if not self.transcription:
-            self.show_message("No Speech Detected", "No speech detected in the audio. Please try again. 🗣️", "warning")
+        if not transcription:
+            self.show_message("No Speech Detected", f"No speech detected in {recording_name}. Please try again. 🗣️", "warning")
             logging.warning("No speech detected in the audio.")
-            self.transcribe_button.configure(state="normal")
+            self.event_bus.progress(f"{recording_name}: No speech detected", 1.0)
+            self.update_catalog(recording_folder, ANALYZED, num_speakers=0)
             return
 
         # Proceed with analysis for each selected model
-        for model_name in self.selected_models:
-            model_id = {
-                'paraphrase-MiniLM-L12-v2': 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2',
-                'paraphrase-mpnet-base-v2': 'sentence-transformers/paraphrase-multilingual-mpnet-base-v2',
-                'all-mpnet-base-v2': 'sentence-transformers/all-mpnet-base-v2',
-                'LaBSE': 'sentence-transformers/LaBSE',
-            }.get(model_name)
+        topics = settings['topics']
+        models = settings['models']
+        for i, model_name in enumerate(models):
+            self.event_bus.progress(f"{recording_name}: Analyzing with {model_name}", (i + 1) / (len(models) + 1))
+            model_id = SENTENCE_MODELS.get(model_name)
 
             if not model_id:
                 self.show_message("Model Not Found", f"Model {model_name} not found. ❌", "warning")
@@ -737,42 +1033,174 @@ class MainApplication(ctk.CTk):
                 model_app = TopicRelevanceAndClusteringApp(model_name=model_id)
 
                 # Process data
-                data = model_app.process_data(self.transcription, self.topics)
+                data = model_app.process_data(transcription, topics, artifact_store=artifact_store)
                 if data.empty:
                     self.show_message("No Data", f"No data to process for model {model_name}. ❌", "warning")
                     logging.warning(f"No data returned from process_data for model {model_name}.")
                     continue
 
-                # Perform clustering
-                clustered_data = model_app.perform_clustering(data, num_clusters=self.num_speakers.get())
-                logging.debug(f"Clustering completed for model {model_name}.")
+                # Add the segments to the cross-session search index
+                try:
+                    SegmentIndex(model_id).append_recording(recording_key(recording_folder),
+                                                            segments_from_data(data, recording_folder),
+                                                            data.embeddings)
+                except Exception as e:
+                    logging.error(f"Failed to index segments for model {model_name}: {e}")
+
+                # Perform clustering, either per session or in the shared cross-session space
+                cluster_model = None
+                if settings['cross_session']:
+                    cluster_model = CrossSessionClusterModel.load(model_id)
+                clustered_data, clustering = model_app.perform_clustering(data, num_clusters=settings['num_speakers'],
+                                                                          artifact_store=artifact_store,
+                                                                          cluster_model=cluster_model,
+                                                                          session_id=recording_folder)
+                logging.debug(f"Clustering completed for model {model_name} "
+                              f"({'cross-session' if clustering['cross_session'] else 'per session'}).")
+
+                # Keep the results so past sessions can be reloaded without recomputation
+                try:
+                    save_analysis_results(clustered_data, results_path(recording_folder, model_id), {
+                        'model_id': model_id,
+                        'model_name': model_name,
+                        'topics': topics,
+                        # The mode actually used; cross-session falls back to per session until its model is ready
+                        'num_clusters': clustering['num_clusters'],
+                        'cross_session': clustering['cross_session'],
+                        'num_speakers': settings['num_speakers'],
+                        'diarization_mode': settings['diarization_mode'],
+                        'whisper_model': 'medium',
+                        'recording_folder': recording_folder,
+                        'recording_start_time': settings['recording_start_time'],
+                    })
+                except Exception as e:
+                    logging.error(f"Failed to save analysis results for model {model_name}: {e}")
+
+                # Plot from a DataFrame view of the result columns; embeddings are left out
+                plot_data = clustered_data.to_pandas()
 
                 # Format time for display
-                if 'time' in clustered_data.columns:
-                    clustered_data['formatted_time'] = clustered_data['time'].dt.strftime('%Y-%m-%d %H:%M:%S')
+                if 'time' in plot_data.columns:
+                    plot_data['formatted_time'] = plot_data['time'].dt.strftime('%Y-%m-%d %H:%M:%S')
 
                 # Create plots in the main thread
-                self.after(0, lambda data=clustered_data, model=model_name: self.create_cluster_plot(data, model))
-                self.after(0, lambda data=clustered_data, topics=self.topics, model=model_name: self.create_relevance_plot(data, topics, model))
+                self.event_bus.publish(RESULT, name='plots', data=plot_data, model_name=model_name, topics=topics)
 
                 # Notify user of completion
-                self.show_message("Transcription Completed", f"✅ Transcription and analysis completed for {model_name}.", "info")
+                self.show_message("Transcription Completed", f"✅ Transcription and analysis of {recording_name} completed for {model_name}.", "info")
 
             except Exception as e:
                 self.show_message("Processing Error", f"An error occurred while processing model {model_name}: {e} ⚠️", "error")
                 logging.error(f"An error occurred while processing model {model_name}: {e}")
 
+        self.update_catalog(recording_folder, ANALYZED, num_speakers=len({entry['speaker'] for entry in transcription}))
+
         # Display transcription in the main thread
-        self.after(0, self.update_transcription_text)
+        self.event_bus.publish(RESULT, name='transcription', job=job, transcription=transcription)
+        self.event_bus.progress(f"{recording_name}: Analysis complete", 1.0)
+
+    def show_job_transcription(self, job, transcription):
+        """Make a finished job's recording the current one and show its transcript."""
+        self.audio_file_path = job.audio_path
+        self.audio_start_time = job.settings['recording_start_time']
+        self.topics = job.settings['topics']
+        self.selected_models = job.settings['models']
+        self.transcription = transcription
+        self.reset_player()
+        self.update_transcription_text()
+
+    def refresh_jobs(self):
+        self.jobs_text.delete('0.0', tk.END)
+        for job in reversed(self.job_queue.snapshot()):
+            self.jobs_text.insert(tk.END, format_job(job) + "\n")
+
+    def scan_catalog(self):
+        try:
+            self.catalog.scan("trials")
+        except Exception as e:
+            logging.error(f"Failed to scan recordings into the catalog: {e}")
+        self.event_bus.publish(RESULT, name='catalog', folder="trials")
 
-        self.transcribe_button.configure(state="normal")
-        logging.debug("Transcribe and analyze button re-enabled.")
+    def update_catalog(self, recording_folder, status=None, **fields):
+        """Index a saved recording, or record how its analysis ended; safe from any thread."""
+        try:
+            if status is None:
+                self.catalog.index_recording(recording_folder)
+            else:
+                self.catalog.record_analysis(recording_folder, status, **fields)
+        except Exception as e:
+            logging.error(f"Failed to update the catalog for {recording_folder}: {e}")
+        self.event_bus.publish(RESULT, name='catalog', folder=recording_folder)
+
+    def refresh_recordings(self):
+        self.recordings_text.delete('0.0', tk.END)
+        for row in self.catalog.query():
+            self.recordings_text.insert(tk.END, format_recording(row) + "\n")
+
+    def load_analysis(self):
+        """Reload a saved analysis into the transcript and the Cluster and Relevance plots."""
+        path = filedialog.askopenfilename(title="Load Analysis", initialdir="trials",
+                                          filetypes=[("Analysis results", "*.parquet")])
+        if not path:
+            return
+        try:
+            metadata = read_metadata(path)
+            topics = metadata.get('topics', [])
+            model_name = metadata.get('model_name', os.path.basename(path))
+            # Only the plotted and transcript columns are read; embeddings stay on disk.
+            # Older results have no 'start' column and can't seek playback.
+            columns = ['text', 'speaker', 'time', 'start', 'Cluster', 'x', 'y'] + topics
+            available = result_columns(path)
+            result, _ = load_analysis_results(path, columns=[column for column in columns if column in available])
+            data = result.to_pandas()
+
+            # Point playback at the analyzed recording so plot clicks seek in the right audio
+            recording_folder = metadata.get('recording_folder', os.path.dirname(path))
+            audio_file_path = find_audio(recording_folder)
+            if audio_file_path is None:
+                logging.warning(f"No audio found in {recording_folder}, playback is unavailable for this analysis.")
+            else:
+                self.play_button.configure(state="normal")
+            self.audio_file_path = audio_file_path
+            start_time = metadata.get('recording_start_time')
+            self.audio_start_time = datetime.fromisoformat(start_time) if start_time else None
+            self.reset_player()
+
+            # Show the loaded transcript, so clicking a line seeks in this recording
+            if {'text', 'speaker', 'time', 'start'}.issubset(data.columns):
+                self.transcription = [{'time': row.time, 'speaker': row.speaker, 'text': row.text, 'start': row.start}
+                                      for row in data.itertuples(index=False)]
+            else:
+                self.transcription = []
+            self.update_transcription_text()
+
+            self.create_cluster_plot(data, model_name)
+            self.create_relevance_plot(data, topics, model_name)
+            logging.info(f"Loaded analysis results from {path}.")
+        except Exception as e:
+            logging.error(f"Failed to load analysis results from {path}: {e}")
+            self.show_message("Load Error", f"Failed to load analysis results: {e} ⚠️", "error")
 
     def update_transcription_text(self):
         self.transcription_text.delete('0.0', tk.END)
-        self.transcription_text.insert(tk.END, self.formatted_transcript)
+        # Tag each segment so clicking it starts playback there
+        for text, index in format_transcript(self.transcription):
+            if index is None:
+                self.transcription_text.insert(tk.END, text)
+            else:
+                tag = f"segment_{index}"
+                self.transcription_text.insert(tk.END, text, tags=tag)
+                self.transcription_text.tag_bind(tag, "<Button-1>", lambda event, i=index: self.play_segment(i))
         logging.info("Transcription text updated in the Transcription tab.")
 
+    def on_relevance_click(self, event):
+        """Play the transcript segment closest to a click on the Relevance Plot."""
+        if event.xdata is None or self.relevance_points is None:
+            return
+        xs, starts = self.relevance_points
+        nearest = int(np.argmin(np.abs(xs - event.xdata)))
+        self.play_audio(seconds=float(starts[nearest]))
+
     def create_cluster_plot(self, data, model_name):
         try:
             self.cluster_fig.clf()
@@ -796,6 +1224,9 @@ class MainApplication(ctk.CTk):
         try:
             self.relevance_fig.clf()
             ax = self.relevance_fig.add_subplot(111)
+            self.relevance_points = None
+            if 'start' in data.columns and 'time' in data.columns:
+                self.relevance_points = (mdates.date2num(data['time']), data['start'].to_numpy())
             for topic in topics:
                 if topic in data.columns and 'time' in data.columns:
                     ax.plot(data['time'], data[topic], label=topic)
@@ -812,22 +1243,65 @@ class MainApplication(ctk.CTk):
 
     def show_message(self, title, message, icon_type):
         """
-        Display a message box using tkinter's messagebox.
-        Also logs the message.
+        Log a message and publish it on the event bus. Safe to call from any
+        thread and never blocks; the main loop shows it as a toast and in the
+        Log tab.
         """
         log_message = f"{title}: {message}"
-        if icon_type == "info":
-            logging.info(log_message)
-            messagebox.showinfo(title, message)
-        elif icon_type == "warning":
+        if icon_type == "warning":
             logging.warning(log_message)
-            messagebox.showwarning(title, message)
         elif icon_type == "error":
             logging.error(log_message)
-            messagebox.showerror(title, message)
         else:
+            icon_type = "info"
             logging.info(log_message)
-            messagebox.showinfo(title, message)
+        self.event_bus.message(title, message, icon_type)
+
+    def process_events(self):
+        """Drain the event bus into the progress bar, toast and Log tab, then reschedule."""
+        try:
+            for event in self.event_bus.drain(max_events=100):
+                self.log_text.insert(tk.END, format_event(event) + "\n")
+                self.log_text.see(tk.END)
+                if event.kind == PROGRESS:
+                    self.progress_label.configure(text=event.payload['stage'])
+                    if event.payload['fraction'] is not None:
+                        self.progress_bar.set(event.payload['fraction'])
+                elif event.kind == MESSAGE:
+                    # Never modal: a box would stall the meter and this loop until dismissed
+                    self.show_toast(f"{event.payload['title']}: {event.payload['message']}")
+                elif event.kind == RESULT:
+                    self.handle_result(event.payload)
+        except Exception as e:
+            logging.error(f"Failed to process events: {e}")
+        self.after(100, self.process_events)
+
+    def handle_result(self, payload):
+        """Apply a worker's RESULT event to the UI; runs on the main loop."""
+        name = payload.get('name')
+        if name == 'job':
+            self.refresh_jobs()
+        elif name == 'catalog':
+            self.refresh_recordings()
+        elif name == 'recording':
+            # Analyze it in the background while the next trial records
+            if self.auto_analyze.get() == 1:
+                self.enqueue_analysis(payload['audio_path'], payload['start_time'], PRIORITY_AUTO)
+        elif name == 'plots':
+            self.create_cluster_plot(payload['data'], payload['model_name'])
+            self.create_relevance_plot(payload['data'], payload['topics'], payload['model_name'])
+        elif name == 'transcription':
+            self.show_job_transcription(payload['job'], payload['transcription'])
+        elif name == 'live_relevance_start':
+            self.reset_live_relevance_plot(payload['topics'], payload['model_name'])
+        elif name == 'live_relevance':
+            self.append_live_relevance_point(payload['time'], payload['scores'])
+
+    def show_toast(self, text, duration_ms=5000):
+        self.toast_label.configure(text=text)
+        if self.toast_job is not None:
+            self.after_cancel(self.toast_job)
+        self.toast_job = self.after(duration_ms, lambda: self.toast_label.configure(text=""))
 
 if __name__ == "__main__":
     app = MainApplication()
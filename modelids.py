@@ -0,0 +1,6 @@
+# modelids.py
+
+
+def model_slug(model_id):
+    """Turn a Hugging Face model id into a file-name friendly string."""
+    return model_id.replace('/', '__')
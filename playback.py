@@ -0,0 +1,133 @@
+# playback.py
+
+import os
+import struct
+import threading
+import logging
+import numpy as np
+import sounddevice as sd
+import soundfile as sf
+from archive import audio_info
+
+SEGMENT_INDEX_FILE = "segment_index.npy"
+
+
+def wav_data_offset(audio_path):
+    """Return (byte offset, byte length) of the sample data in a 16-bit PCM WAV file."""
+    with open(audio_path, 'rb') as f:
+        riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave_id != b'WAVE':
+            raise ValueError(f"{audio_path} is not a WAV file")
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"No data chunk in {audio_path}")
+            chunk_id, size = struct.unpack('<4sI', header)
+            if chunk_id == b'data':
+                return f.tell(), size
+            f.seek(size + (size & 1), os.SEEK_CUR)  # Chunks are word aligned
+
+
+def build_segment_index(audio_path, starts):
+    """
+    Turn segment start times (seconds) into sample offsets in the recording
+    and store them next to it, so seeking never has to scan the audio.
+    """
+    _, rate, _ = audio_info(audio_path)
+    offsets = np.round(np.asarray(starts, dtype=np.float64) * rate).astype(np.int64)
+    np.save(os.path.join(os.path.dirname(audio_path), SEGMENT_INDEX_FILE), offsets)
+    return offsets
+
+
+def load_segment_index(audio_path):
+    path = os.path.join(os.path.dirname(audio_path), SEGMENT_INDEX_FILE)
+    return np.load(path) if os.path.exists(path) else None
+
+
+class SegmentPlayer:
+    """
+    Plays a recording from any sample offset. WAV samples are memory-mapped
+    so starting anywhere in a long recording only touches the pages being
+    played; FLAC archives are seeked and decoded block by block.
+    """
+    def __init__(self, audio_path):
+        self.audio_path = audio_path
+        self.frames, self.rate, self.channels = audio_info(audio_path)
+        # Mic array recordings have more channels than most outputs; those are mixed down
+        self.output_channels = min(self.channels, sd.query_devices(kind='output')['max_output_channels'])
+        self.segment_offsets = load_segment_index(audio_path)
+        self.samples = None
+        self.sound_file = None
+        if audio_path.endswith('.wav'):
+            offset, size = wav_data_offset(audio_path)
+            self.samples = np.memmap(audio_path, dtype='<i2', mode='r', offset=offset,
+                                     shape=(size // (2 * self.channels), self.channels))
+        else:
+            self.sound_file = sf.SoundFile(audio_path)
+        self.position = 0
+        self.stream = None
+        self.paused = False
+        self.lock = threading.Lock()
+
+    @property
+    def busy(self):
+        return self.stream is not None and self.stream.active
+
+    def set_segments(self, starts):
+        self.segment_offsets = build_segment_index(self.audio_path, starts)
+
+    def play_segment(self, index):
+        if self.segment_offsets is None or not 0 <= index < len(self.segment_offsets):
+            raise IndexError(f"No segment {index} in the playback index")
+        self.play_from_frame(int(self.segment_offsets[index]))
+
+    def play_from(self, seconds):
+        self.play_from_frame(int(seconds * self.rate))
+
+    def play_from_frame(self, frame):
+        self.stop()
+        with self.lock:
+            self.position = min(max(frame, 0), self.frames)
+            if self.sound_file is not None:
+                self.sound_file.seek(self.position)
+        self.stream = sd.OutputStream(samplerate=self.rate, channels=self.output_channels, dtype='int16',
+                                      callback=self._callback)
+        self.stream.start()
+        self.paused = False
+        logging.debug(f"Playback of {self.audio_path} started at frame {self.position}.")
+
+    def _callback(self, outdata, frames, time_info, status):
+        with self.lock:
+            if self.samples is not None:
+                block = self.samples[self.position:self.position + frames]
+            else:
+                block = self.sound_file.read(frames, dtype='int16', always_2d=True)
+            if self.output_channels != self.channels:
+                # Mix every mic into one signal, played on each output channel
+                block = block.mean(axis=1, keepdims=True).astype(np.int16)
+            outdata[:len(block)] = block
+            outdata[len(block):] = 0
+            self.position += len(block)
+        if len(block) < frames:
+            raise sd.CallbackStop
+
+    def pause(self):
+        if self.busy:
+            self.stream.stop()
+            self.paused = True
+
+    def resume(self):
+        if self.stream is not None and self.paused:
+            self.stream.start()
+            self.paused = False
+
+    def stop(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        self.paused = False
+
+    def close(self):
+        self.stop()
+        if self.sound_file is not None:
+            self.sound_file.close()
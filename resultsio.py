@@ -0,0 +1,89 @@
+# resultsio.py
+
+import os
+import json
+import time
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from modelids import model_slug
+from analysisresult import AnalysisResult
+
+RESULTS_VERSION = 1
+METADATA_KEY = b'speechnr'
+
+
+def results_path(recording_folder, model_id):
+    return os.path.join(recording_folder, f"analysis_{model_slug(model_id)}.parquet")
+
+
+def save_analysis_results(data, path, metadata):
+    """
+    Save one AnalysisResult as Parquet. Its columns are stored as typed
+    columns, the embedding matrix as a fixed-size float32 list column, and
+    the model and settings as JSON in the schema metadata.
+    """
+    table = pa.table({name: data[name] for name in data.column_names})
+
+    if data.embeddings.size:
+        # The matrix is already contiguous float32, so Arrow wraps its buffer as is
+        flat = pa.array(data.embeddings.reshape(-1), type=pa.float32())
+        table = table.append_column('embedding', pa.FixedSizeListArray.from_arrays(flat, data.embeddings.shape[1]))
+
+    metadata = dict(metadata, version=RESULTS_VERSION, saved_at=time.time())
+    schema_metadata = dict(table.schema.metadata or {})
+    schema_metadata[METADATA_KEY] = json.dumps(metadata, default=str).encode('utf-8')
+    table = table.replace_schema_metadata(schema_metadata)
+
+    tmp_path = path + '.tmp'
+    pq.write_table(table, tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+
+
+def read_metadata(path):
+    """Read the analysis settings from the Parquet footer only."""
+    schema_metadata = pq.read_schema(path).metadata or {}
+    return json.loads(schema_metadata.get(METADATA_KEY, b'{}'))
+
+
+def result_columns(path):
+    """Names of the columns stored in a saved analysis, read from the footer only."""
+    return pq.read_schema(path).names
+
+
+def embeddings_from_column(column):
+    """View a fixed-size float32 list column as an (n, dim) array without copying when possible."""
+    column = column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+    if len(column) == 0:
+        return np.zeros((0, column.type.list_size), dtype=np.float32)
+    values = column.flatten().to_numpy(zero_copy_only=False)
+    return values.reshape(len(column), column.type.list_size)
+
+
+def load_analysis_results(path, columns=None):
+    """
+    Load a saved analysis as (AnalysisResult, metadata), reading only
+    `columns` if given. The embedding column is only decoded when requested.
+    """
+    table = pq.read_table(path, columns=columns)
+    embeddings = None
+    if 'embedding' in table.column_names:
+        embeddings = embeddings_from_column(table.column('embedding'))
+        table = table.drop(['embedding'])
+    data = AnalysisResult({name: table.column(name).combine_chunks().to_numpy(zero_copy_only=False)
+                           for name in table.column_names}, embeddings)
+    return data, read_metadata(path)
+
+
+def load_embeddings(path):
+    """Read only the embedding column of a saved analysis as an (n, dim) float32 array."""
+    return embeddings_from_column(pq.read_table(path, columns=['embedding']).column('embedding'))
+
+
+def find_results(trials_dir, model_id=None):
+    """Yield every saved analysis under trials_dir, optionally for a single model."""
+    suffix = f"_{model_slug(model_id)}.parquet" if model_id else ".parquet"
+    for root, _, files in os.walk(trials_dir):
+        for name in sorted(files):
+            if name.startswith("analysis_") and name.endswith(suffix):
+                yield os.path.join(root, name)
@@ -0,0 +1,247 @@
+# ringbuffer.py
+
+import os
+import time
+import threading
+import logging
+import numpy as np
+import multiprocessing
+from multiprocessing import shared_memory, resource_tracker
+
+# Header fields, stored as int64 at the start of the shared block
+WRITE_POSITION = 0  # Total frames written since the ring was created
+CAPACITY = 1
+CHANNELS = 2
+MAX_CONSUMERS = 3
+HEADER_FIELDS = 4
+
+FREE_SLOT = -1
+
+
+class AudioRingBuffer:
+    """
+    Fixed-size ring of float32 (frames, channels) audio in shared memory,
+    written by the capture loop and read by any number of consumers.
+
+    Each consumer owns a read cursor in the shared header and gets NumPy
+    views straight into the ring, so fanning capture out to a meter, VAD,
+    live transcriber or disk writer costs no copies. The writer never waits
+    for readers: a consumer that falls more than `capacity` frames behind
+    loses the overwritten frames, which is reported by `write` on the
+    capture side and counted in the consumer's `dropped`.
+
+    Consumers in other processes attach with `AudioRingBuffer.attach(name, slot)`
+    using a slot reserved here with `reserve_slot`.
+    """
+    def __init__(self, capacity, channels, max_consumers=8, name=None, create=True):
+        header_bytes = 8 * (HEADER_FIELDS + 2 * max_consumers)
+        if create:
+            size = header_bytes + 4 * capacity * channels
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self.shm = _attach(name)
+        header = np.ndarray((HEADER_FIELDS + 2 * max_consumers,), dtype=np.int64, buffer=self.shm.buf)
+        if create:
+            header[:HEADER_FIELDS] = [0, capacity, channels, max_consumers]
+            header[HEADER_FIELDS:] = FREE_SLOT
+            header[HEADER_FIELDS + max_consumers:] = 0
+        self.header = header[:HEADER_FIELDS]
+        self.capacity = int(self.header[CAPACITY])
+        self.channels = int(self.header[CHANNELS])
+        self.cursors = header[HEADER_FIELDS:HEADER_FIELDS + max_consumers]  # Next frame each consumer reads
+        self.dropped = header[HEADER_FIELDS + max_consumers:]  # Frames each consumer lost to overruns
+        self.data = np.ndarray((self.capacity, self.channels), dtype=np.float32, buffer=self.shm.buf,
+                               offset=header_bytes)
+        self.owner = create
+        self.lock = threading.Lock()
+        self.lagging = set()  # Slots already reported as overrun
+        self.writer_closed = False  # No more frames; the block is freed once every slot is released
+        self.unlinked = False
+
+    @classmethod
+    def attach(cls, name, slot, max_consumers=8):
+        """Open an existing ring from another process and return the consumer for `slot`."""
+        ring = cls(0, 0, max_consumers=max_consumers, name=name, create=False)
+        return RingConsumer(ring, slot, f"slot {slot}")
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def position(self):
+        return int(self.header[WRITE_POSITION])
+
+    @property
+    def closed(self):
+        return self.data is None
+
+    def reserve_slot(self):
+        """Claim a free consumer slot, starting at the current write position."""
+        with self.lock:
+            free = np.flatnonzero(self.cursors == FREE_SLOT)
+            if not len(free):
+                raise RuntimeError(f"All {len(self.cursors)} ring buffer consumer slots are in use")
+            slot = int(free[0])
+            self.dropped[slot] = 0
+            self.cursors[slot] = self.position
+        return slot
+
+    def add_consumer(self, name):
+        """Register an in-process consumer reading from the current write position."""
+        return RingConsumer(self, self.reserve_slot(), name)
+
+    def release_slot(self, slot):
+        with self.lock:
+            if self.closed:
+                return
+            self.cursors[slot] = FREE_SLOT
+            self.lagging.discard(slot)
+            if self.writer_closed and not self.active_consumers():
+                self._free()
+
+    def write(self, block):
+        """
+        Append a (frames, channels) block. Returns the slots of consumers
+        that have just fallen a full ring behind and started losing frames.
+        """
+        frames = len(block)
+        position = self.position
+        start = position % self.capacity
+        first = min(frames, self.capacity - start)
+        self.data[start:start + first] = block[:first]
+        self.data[:frames - first] = block[first:]
+        # Publish the frames only once they are in place
+        self.header[WRITE_POSITION] = position + frames
+
+        newly_lagging = []
+        for slot, cursor in enumerate(self.cursors):
+            if cursor == FREE_SLOT:
+                continue
+            if position + frames - cursor > self.capacity:
+                if slot not in self.lagging:
+                    self.lagging.add(slot)
+                    newly_lagging.append(slot)
+            else:
+                self.lagging.discard(slot)
+        return newly_lagging
+
+    def active_consumers(self, exclude=()):
+        return [slot for slot, cursor in enumerate(self.cursors) if cursor != FREE_SLOT and slot not in exclude]
+
+    def close(self, wait=0.0):
+        """
+        Stop writing and detach from the shared block. On the creating side
+        the block stays readable until every consumer has released its slot,
+        so a slow consumer still gets the last frames; `wait` seconds are
+        given for that before returning. Its name is removed right away:
+        consumers in other processes release their slots in their own
+        process, and mappings stay valid after the unlink.
+        """
+        deadline = time.time() + wait
+        while self.owner and self.active_consumers() and time.time() < deadline:
+            time.sleep(0.05)
+        with self.lock:
+            if self.closed:
+                return
+            self.writer_closed = True
+            if self.owner:
+                self._unlink()
+            held = self.active_consumers() if self.owner else []
+            if held:
+                logging.info(f"Audio ring buffer kept open until {len(held)} consumers finish reading.")
+                return
+            self._free()
+
+    def _free(self):
+        # Called with the lock held
+        self.header = self.cursors = self.dropped = self.data = None
+        try:
+            self.shm.close()
+        except BufferError:
+            logging.warning("Audio ring buffer views are still in use; the block is freed once they are released.")
+        if self.owner:
+            self._unlink()
+
+    def _unlink(self):
+        if not self.unlinked:
+            self.unlinked = True
+            self.shm.unlink()
+
+
+class RingConsumer:
+    """One reader of an AudioRingBuffer, with its own cursor."""
+    def __init__(self, ring, slot, name):
+        self.ring = ring
+        self.slot = slot
+        self.name = name
+
+    @property
+    def position(self):
+        """Absolute index of the next frame this consumer will read."""
+        return int(self.ring.cursors[self.slot])
+
+    @property
+    def dropped(self):
+        return int(self.ring.dropped[self.slot])
+
+    @property
+    def lag(self):
+        return self.ring.position - self.position
+
+    def read(self, max_frames=None):
+        """
+        Return (first frame index, views) of the frames written since the
+        last read, oldest first; there are two views when the data wraps
+        around the end of the ring. Views are only valid until the writer
+        comes around again, `capacity` frames later. After the writer
+        closes the ring, the remaining frames can still be read until this
+        consumer is closed.
+        """
+        with self.ring.lock:
+            return self._read(max_frames)
+
+    def _read(self, max_frames):
+        ring = self.ring
+        if ring.closed or self.slot is None:
+            return None, []
+        end = ring.position
+        cursor = self.position
+        if end - cursor > ring.capacity:
+            # Overrun: skip what was overwritten and report it
+            lost = end - cursor - ring.capacity
+            ring.dropped[self.slot] += lost
+            logging.warning(f"Ring buffer consumer {self.name} fell behind, {lost} frames dropped.")
+            cursor = end - ring.capacity
+        if max_frames is not None:
+            end = min(end, cursor + max_frames)
+        start = cursor % ring.capacity
+        frames = end - cursor
+        first = min(frames, ring.capacity - start)
+        views = [ring.data[start:start + first]]
+        if frames > first:
+            views.append(ring.data[:frames - first])
+        ring.cursors[self.slot] = end
+        return cursor, [view for view in views if len(view)]
+
+    def close(self):
+        if self.slot is None:
+            return
+        self.ring.release_slot(self.slot)
+        self.slot = None
+        if not self.ring.owner:
+            self.ring.close()
+
+
+def _attach(name):
+    # Only the creating process should unlink the block; the resource
+    # tracker would otherwise remove it when an attached process exits.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        shm = shared_memory.SharedMemory(name=name)
+        # Children started by multiprocessing share the creator's tracker, where
+        # the block is already registered; only a tracker of our own must forget it.
+        if os.name == 'posix' and multiprocessing.parent_process() is None:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
@@ -0,0 +1,279 @@
+# searchindex.py
+
+import os
+import json
+import time
+import argparse
+import threading
+import logging
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from modelids import model_slug
+from resultsio import find_results, load_analysis_results, load_embeddings
+
+TRIALS_DIR = "trials"
+SEARCH_INDEX_DIR = os.path.join(TRIALS_DIR, "search_index")
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+
+def recording_key(recording_folder, trials_dir=TRIALS_DIR):
+    """Identify a recording by its folder relative to the trials root, e.g. 'sess_010524/rec_101500'."""
+    relative = os.path.relpath(os.path.abspath(recording_folder), os.path.abspath(trials_dir))
+    return relative.replace(os.sep, '/')
+
+
+class SegmentIndex:
+    """
+    Persistent vector index over transcript-segment embeddings of one model.
+
+    Each appended recording becomes a shard: a float32 .npy matrix of
+    unit-normalized embeddings (read memory-mapped), a JSON file with the
+    segment metadata and, once the index is trained, an inverted-file list
+    id per row. Queries probe the `nprobe` closest coarse centroids and only
+    score the rows in those lists; until enough segments exist to train the
+    centroids, every row is scored exactly.
+    """
+    def __init__(self, model_id, base_dir=SEARCH_INDEX_DIR, train_threshold=4096, nprobe=8):
+        self.model_id = model_id
+        self.folder = os.path.join(base_dir, model_slug(model_id))
+        self.train_threshold = train_threshold
+        self.nprobe = nprobe
+        self.lock = threading.Lock()
+        os.makedirs(self.folder, exist_ok=True)
+        self._shards = {}  # shard name -> (vectors memmap, list ids, metadata or None)
+        self.manifest = self._load_manifest()
+        self.centroids = self._load_array("centroids.npy")
+
+    # Persistence
+
+    def _load_manifest(self):
+        try:
+            with open(os.path.join(self.folder, "manifest.json"), 'r') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {'model': self.model_id, 'dim': None, 'shards': [], 'recordings': [], 'next_shard': 0}
+        if 'next_shard' not in manifest:
+            # Older manifests keyed recordings by the folder path as given, so
+            # one recording could be indexed twice; keep its latest shard.
+            latest = {}
+            for shard in manifest['shards']:
+                shard['recording'] = recording_key(shard['recording'])
+                latest[shard['recording']] = shard['name']
+            for shard in manifest['shards']:
+                if latest[shard['recording']] != shard['name']:
+                    self._remove_shard_files(shard['name'])
+            manifest['next_shard'] = len(manifest['shards'])
+            manifest['shards'] = [shard for shard in manifest['shards'] if latest[shard['recording']] == shard['name']]
+            manifest['recordings'] = list(latest)
+            self.manifest = manifest
+            self._save_manifest()
+        return manifest
+
+    def _save_manifest(self):
+        path = os.path.join(self.folder, "manifest.json")
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.manifest, f, indent=4)
+        os.replace(path + '.tmp', path)
+
+    def _load_array(self, name, mmap_mode=None):
+        path = os.path.join(self.folder, name)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode=mmap_mode)
+
+    def _save_array(self, name, array):
+        path = os.path.join(self.folder, name)
+        with open(path + '.tmp', 'wb') as f:
+            np.save(f, array)
+        os.replace(path + '.tmp', path)
+
+    def _shard(self, name):
+        if name not in self._shards:
+            vectors = self._load_array(f"{name}.npy", mmap_mode='r')
+            lists = self._load_array(f"{name}.lists.npy")
+            self._shards[name] = [vectors, lists, None]
+        return self._shards[name]
+
+    def _shard_metadata(self, name):
+        shard = self._shard(name)
+        if shard[2] is None:
+            with open(os.path.join(self.folder, f"{name}.json"), 'r') as f:
+                shard[2] = json.load(f)
+        return shard[2]
+
+    @property
+    def size(self):
+        return sum(shard['rows'] for shard in self.manifest['shards'])
+
+    # Building
+
+    def append_recording(self, recording_id, segments, embeddings):
+        """
+        Add one recording's segments to the index as a new shard.
+
+        `recording_id` is a key from `recording_key`, and `segments` a list of
+        dicts (session, recording, speaker, time, text) aligned with the rows
+        of `embeddings`. A recording that is already indexed, e.g. because it
+        was re-analyzed, has its old shard replaced.
+        """
+        with self.lock:
+            if len(segments) == 0:
+                return False
+
+            vectors = _normalize(embeddings)
+            if self.manifest['dim'] is None:
+                self.manifest['dim'] = int(vectors.shape[1])
+            elif vectors.shape[1] != self.manifest['dim']:
+                raise ValueError(f"Embedding size {vectors.shape[1]} does not match index size {self.manifest['dim']}")
+
+            name = f"shard_{self.manifest['next_shard']:05d}"
+            self.manifest['next_shard'] += 1
+            self._save_array(f"{name}.npy", vectors)
+            with open(os.path.join(self.folder, f"{name}.json"), 'w') as f:
+                json.dump(segments, f, default=str)
+            if self.centroids is not None:
+                self._save_array(f"{name}.lists.npy", self._assign_lists(vectors))
+
+            # The new shard is in the manifest before the stale one is deleted
+            stale = [shard for shard in self.manifest['shards'] if shard['recording'] == recording_id]
+            self.manifest['shards'] = [shard for shard in self.manifest['shards'] if shard['recording'] != recording_id]
+            self.manifest['shards'].append({'name': name, 'rows': int(len(vectors)), 'recording': recording_id,
+                                            'indexed_at': time.time()})
+            if recording_id not in self.manifest['recordings']:
+                self.manifest['recordings'].append(recording_id)
+            self._save_manifest()
+            for shard in stale:
+                self._remove_shard_files(shard['name'])
+            logging.info(f"Indexed {len(vectors)} segments of {recording_id} in {self.folder}"
+                         f"{' (replacing the previous analysis)' if stale else ''}.")
+
+            if self.centroids is None and self.size >= self.train_threshold:
+                self._train()
+            return True
+
+    def _remove_shard_files(self, name):
+        self._shards.pop(name, None)  # Drop the memory map before deleting its file
+        for suffix in (".npy", ".json", ".lists.npy"):
+            try:
+                os.remove(os.path.join(self.folder, name + suffix))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.warning(f"Could not remove {name}{suffix} from the search index: {e}")
+
+    def _assign_lists(self, vectors):
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def _train(self, max_samples=50000):
+        """Fit the coarse centroids and assign every existing shard to its lists."""
+        vectors = np.concatenate([self._shard(shard['name'])[0] for shard in self.manifest['shards']])
+        if len(vectors) > max_samples:
+            rng = np.random.default_rng(42)
+            vectors = vectors[rng.choice(len(vectors), max_samples, replace=False)]
+        nlist = int(min(1024, max(16, 4 * np.sqrt(self.size))))
+        kmeans = MiniBatchKMeans(n_clusters=nlist, random_state=42, n_init=3).fit(vectors)
+        self.centroids = _normalize(kmeans.cluster_centers_)
+        self._save_array("centroids.npy", self.centroids)
+        for shard in self.manifest['shards']:
+            lists = self._assign_lists(np.asarray(self._shard(shard['name'])[0]))
+            self._save_array(f"{shard['name']}.lists.npy", lists)
+            self._shards[shard['name']][1] = lists
+        logging.info(f"Trained search index with {nlist} lists over {self.size} segments.")
+
+    def rebuild(self):
+        """Retrain the coarse centroids, e.g. after the corpus has grown a lot."""
+        with self.lock:
+            if self.manifest['shards']:
+                self._train()
+
+    # Querying
+
+    def search(self, query_embedding, k=10):
+        """Return the k best matching segments as dicts with a 'score' key."""
+        if not self.manifest['shards']:
+            return []
+        query = _normalize(query_embedding).reshape(-1)
+        probe = None
+        if self.centroids is not None:
+            probe = np.argsort(-(self.centroids @ query))[:self.nprobe]
+
+        candidates = []  # (score, shard name, row)
+        for shard in self.manifest['shards']:
+            vectors, lists, _ = self._shard(shard['name'])
+            if probe is not None and lists is not None:
+                rows = np.flatnonzero(np.isin(lists, probe))
+                if len(rows) == 0:
+                    continue
+                scores = vectors[rows] @ query
+            else:
+                rows = np.arange(len(vectors))
+                scores = vectors @ query
+            top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+            candidates.extend((float(scores[i]), shard['name'], int(rows[i])) for i in top)
+
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        results = []
+        for score, name, row in candidates[:k]:
+            result = dict(self._shard_metadata(name)[row])
+            result['score'] = score
+            results.append(result)
+        return results
+
+
+def segments_from_data(data, recording_folder):
+    """Build index metadata rows from an AnalysisResult."""
+    session = os.path.basename(os.path.dirname(os.path.normpath(recording_folder)))
+    recording = os.path.basename(os.path.normpath(recording_folder))
+    return [{'session': session, 'recording': recording, 'speaker': row['speaker'],
+             'time': str(row['time']), 'text': row['text']}
+            for row in data.to_pandas(['speaker', 'time', 'text']).to_dict('records')]
+
+
+def index_saved_results(index, trials_dir):
+    """
+    Append every saved analysis of the index's model that is new or was
+    re-analyzed since it was indexed, reading only the needed columns.
+    """
+    indexed_at = {shard['recording']: shard.get('indexed_at', 0) for shard in index.manifest['shards']}
+    added = 0
+    for path in find_results(trials_dir, index.model_id):
+        recording_folder = os.path.dirname(path)
+        key = recording_key(recording_folder, trials_dir)
+        if key in indexed_at and os.path.getmtime(path) <= indexed_at[key]:
+            continue
+        data, _ = load_analysis_results(path, columns=['speaker', 'time', 'text'])
+        added += index.append_recording(key, segments_from_data(data, recording_folder), load_embeddings(path))
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search every indexed transcript for a topic.")
+    parser.add_argument("query", nargs='?', help="Topic or phrase to search for")
+    parser.add_argument("--model", default="sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
+                        help="Sentence model the index was built with")
+    parser.add_argument("-k", type=int, default=10, help="Number of segments to return")
+    parser.add_argument("--add-from", default=None, help="Index the saved analyses under this trials folder first")
+    args = parser.parse_args()
+
+    if args.add_from:
+        added = index_saved_results(SegmentIndex(args.model), args.add_from)
+        print(f"Indexed {added} recordings from {args.add_from}")
+    if not args.query:
+        return
+
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(args.model)
+    index = SegmentIndex(args.model)
+    for result in index.search(model.encode(args.query), k=args.k):
+        print(f"{result['score']:.3f}  {result['session']}/{result['recording']}  "
+              f"{result['time']}  {result['speaker']}: {result['text']}")
+
+
+if __name__ == "__main__":
+    main()
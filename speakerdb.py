@@ -0,0 +1,142 @@
+# speakerdb.py
+
+import os
+import json
+import hashlib
+import argparse
+import threading
+import logging
+import numpy as np
+
+SPEAKER_DB_DIR = os.path.join("trials", "speakers")
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / (np.linalg.norm(vectors, axis=-1, keepdims=True) + 1e-12)
+
+
+class SpeakerDatabase:
+    """
+    Reference ECAPA embeddings of enrolled, named speakers.
+
+    All references are kept unit-normalized in one float32 matrix
+    (embeddings.npy); speakers.json holds the names and, for each row, the
+    index of the speaker it belongs to. Matching is a nearest-neighbor
+    lookup over every reference with a cosine similarity threshold.
+    """
+    def __init__(self, folder=SPEAKER_DB_DIR, threshold=0.55):
+        self.folder = folder
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.names = []
+        self.owners = np.zeros(0, dtype=np.int32)
+        self.embeddings = np.zeros((0, 192), dtype=np.float32)
+        self._load()
+
+    def __len__(self):
+        return len(self.names)
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.folder, "speakers.json"), 'r') as f:
+                index = json.load(f)
+            self.names = index['names']
+            self.owners = np.asarray(index['owners'], dtype=np.int32)
+            self.embeddings = np.load(os.path.join(self.folder, "embeddings.npy"))
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+
+    def _save(self):
+        os.makedirs(self.folder, exist_ok=True)
+        embeddings_path = os.path.join(self.folder, "embeddings.npy")
+        with open(embeddings_path + '.tmp', 'wb') as f:
+            np.save(f, self.embeddings)
+        os.replace(embeddings_path + '.tmp', embeddings_path)
+        index_path = os.path.join(self.folder, "speakers.json")
+        with open(index_path + '.tmp', 'w') as f:
+            json.dump({'names': self.names, 'owners': self.owners.tolist()}, f, indent=4)
+        os.replace(index_path + '.tmp', index_path)
+
+    @property
+    def fingerprint(self):
+        """Short digest of the enrolled references, for cache keys."""
+        digest = hashlib.sha256(json.dumps(self.names).encode('utf-8'))
+        digest.update(self.owners.tobytes())
+        digest.update(self.embeddings.tobytes())
+        return digest.hexdigest()[:16]
+
+    def enroll(self, name, embeddings):
+        """Add reference embeddings for a speaker, creating the speaker if needed."""
+        embeddings = _normalize(np.atleast_2d(embeddings))
+        with self.lock:
+            if name not in self.names:
+                self.names.append(name)
+            owner = self.names.index(name)
+            self.embeddings = np.concatenate([self.embeddings, embeddings])
+            self.owners = np.concatenate([self.owners, np.full(len(embeddings), owner, dtype=np.int32)])
+            self._save()
+        logging.info(f"Enrolled {len(embeddings)} reference embeddings for {name}.")
+
+    def remove(self, name):
+        with self.lock:
+            if name not in self.names:
+                return False
+            owner = self.names.index(name)
+            keep = self.owners != owner
+            self.embeddings = self.embeddings[keep]
+            # Speakers after the removed one move up by one
+            self.owners = self.owners[keep] - (self.owners[keep] > owner)
+            self.names.pop(owner)
+            self._save()
+        return True
+
+    def match(self, embeddings):
+        """
+        Return the nearest enrolled speaker for each embedding (None below
+        the threshold) and the corresponding cosine similarities.
+        """
+        embeddings = _normalize(np.atleast_2d(embeddings))
+        if len(self.embeddings) == 0:
+            return [None] * len(embeddings), np.zeros(len(embeddings), dtype=np.float32)
+        similarities = embeddings @ self.embeddings.T
+        nearest = np.argmax(similarities, axis=1)
+        scores = similarities[np.arange(len(embeddings)), nearest]
+        names = [self.names[self.owners[row]] if score >= self.threshold else None
+                 for row, score in zip(nearest, scores)]
+        return names, scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the enrolled speakers used to label transcripts.")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    enroll = subparsers.add_parser("enroll", help="Enroll a speaker from a clip of a recording")
+    enroll.add_argument("name")
+    enroll.add_argument("audio_path")
+    enroll.add_argument("--start", type=float, default=0.0, help="Clip start in seconds")
+    enroll.add_argument("--end", type=float, default=None, help="Clip end in seconds")
+    enroll.add_argument("--chunk", type=float, default=3.0, help="Seconds per reference embedding")
+    remove = subparsers.add_parser("remove", help="Remove an enrolled speaker")
+    remove.add_argument("name")
+    subparsers.add_parser("list", help="List enrolled speakers")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    database = SpeakerDatabase()
+    if args.action == "enroll":
+        from archive import audio_info
+        from transcription import compute_segment_embeddings
+        frames, rate, _ = audio_info(args.audio_path)
+        end = min(args.end or frames / rate, frames / rate)
+        starts = np.arange(args.start, max(end - args.chunk, args.start) + 1e-9, args.chunk)
+        clips = [{'start': start, 'end': min(start + args.chunk, end)} for start in starts]
+        database.enroll(args.name, compute_segment_embeddings(args.audio_path, clips))
+    elif args.action == "remove":
+        print(f"Removed {args.name}" if database.remove(args.name) else f"{args.name} is not enrolled")
+    else:
+        for owner, name in enumerate(database.names):
+            print(f"{name}: {int(np.sum(database.owners == owner))} references")
+
+
+if __name__ == "__main__":
+    main()
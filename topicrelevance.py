@@ -1,20 +1,24 @@
 # topicrelevance.py
 
-import pandas as pd
 import numpy as np
 import logging
+from collections import deque
 from sentence_transformers import SentenceTransformer, util
 from sklearn.cluster import KMeans
 from sklearn.decomposition import PCA
+from artifacts import cached_stage, hash_texts
+from analysisresult import AnalysisResult
 
 class TopicRelevanceAndClusteringApp:
     def __init__(self, model_name='sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2', hf_token=None):
+        self.model_name = model_name
         try:
             # Use the Hugging Face token if provided
             self.model = SentenceTransformer(model_name, use_auth_token=hf_token)
         except Exception as e:
             logging.error(f"Failed to load model {model_name}: {e}")
             self.model = None
+        self.live_topics = []
 
     def compute_relevance(self, phrase, topic):
         if self.model is None:
@@ -24,26 +28,101 @@ class TopicRelevanceAndClusteringApp:
         similarity = util.pytorch_cos_sim(phrase_embedding, topic_embedding).item()
         return similarity
 
-    def process_data(self, transcription, topics):
-        data = pd.DataFrame(transcription)
+    def start_live_relevance(self, topics, window_seconds=60):
+        """
+        Prepare incremental scoring: topic embeddings are computed once, and a
+        rolling sum over the last `window_seconds` gives the windowed average
+        without re-scoring earlier segments.
+        """
+        self.live_topics = list(topics)
+        topic_embeddings = self.model.encode(self.live_topics)
+        self.live_topic_embeddings = topic_embeddings / np.linalg.norm(topic_embeddings, axis=1, keepdims=True)
+        self.live_window_seconds = window_seconds
+        self.live_window = deque()  # (timestamp, scores) of segments inside the window
+        self.live_window_sum = np.zeros(len(self.live_topics))
+
+    def score_live_segment(self, text, timestamp):
+        """
+        Score one new transcript segment against the live topics.
+        Returns (scores of this segment, rolling average over the window).
+        """
+        embedding = self.model.encode(text)
+        scores = self.live_topic_embeddings @ (embedding / (np.linalg.norm(embedding) or 1))
+
+        seconds = timestamp.timestamp()
+        self.live_window.append((seconds, scores))
+        self.live_window_sum += scores
+        while seconds - self.live_window[0][0] > self.live_window_seconds:
+            _, old_scores = self.live_window.popleft()
+            self.live_window_sum -= old_scores
+
+        return scores, self.live_window_sum / len(self.live_window)
+
+    def process_data(self, transcription, topics, artifact_store=None):
         if self.model is None:
             logging.error("Model not loaded, cannot process data.")
-            return pd.DataFrame()  # Return empty DataFrame
-        data['embedding'] = data['text'].apply(lambda x: self.model.encode(x))
+            return AnalysisResult()  # Return empty result
+        texts = [segment['text'] for segment in transcription]
+        text_settings = {'model': self.model_name, 'texts': hash_texts(texts)}
+
+        embeddings = cached_stage(artifact_store, 'sentence_embeddings', text_settings,
+                                  lambda: self.model.encode(texts))
+        data = AnalysisResult.from_records(transcription, embeddings)
 
-        for topic in topics:
-            data[topic] = data['text'].apply(lambda x: self.compute_relevance(x, topic))
+        # Score every phrase against every topic from the phrase embeddings,
+        # so changing only the keywords never re-encodes the transcript.
+        def score_topics():
+            topic_embeddings = self.model.encode(topics)
+            return util.cos_sim(embeddings, topic_embeddings).numpy()
+
+        relevance_settings = dict(text_settings, topics=list(topics))
+        relevance = cached_stage(artifact_store, 'topic_relevance', relevance_settings, score_topics)
+        for i, topic in enumerate(topics):
+            data[topic] = relevance[:, i]  # Column views into the relevance matrix
 
         return data
 
-    def perform_clustering(self, data, num_clusters):
-        embeddings = np.stack(data['embedding'].values)
-        kmeans = KMeans(n_clusters=num_clusters, random_state=42)
-        data['Cluster'] = kmeans.fit_predict(embeddings)
+    def perform_clustering(self, data, num_clusters, artifact_store=None, cluster_model=None, session_id=None):
+        """
+        Add Cluster, x and y columns to `data`. Returns (data, clustering),
+        where clustering tells which space was actually used: cross_session
+        and num_clusters.
+        """
+        embeddings = data.embeddings
 
-        pca = PCA(n_components=2)
-        components = pca.fit_transform(embeddings)
-        data['x'] = components[:, 0]
-        data['y'] = components[:, 1]
+        def fit_clusters():
+            kmeans = KMeans(n_clusters=num_clusters, random_state=42)
+            labels = kmeans.fit_predict(embeddings)
+            pca = PCA(n_components=2)
+            components = pca.fit_transform(embeddings)
+            return {'labels': labels, 'components': components}
 
-        return data
+        def assign_cross_session_clusters():
+            # Fold this session into the shared model, then place it in the
+            # shared cluster space; None until the model has seen enough
+            # phrases for a first fit.
+            cluster_model.update(embeddings, session_id)
+            if not cluster_model.ready:
+                logging.info("Cross-session cluster model not ready yet, clustering this session alone.")
+                return None
+            labels, components = cluster_model.assign(embeddings)
+            return {'labels': labels, 'components': components}
+
+        clusters = None
+        if cluster_model is not None:
+            # Assignment against the shared model is cheap and the model keeps
+            # evolving, so it is not cached per recording.
+            clusters = assign_cross_session_clusters()
+        cross_session = clusters is not None
+        if clusters is None:
+            cluster_settings = {'model': self.model_name, 'texts': hash_texts(list(data['text'])),
+                                'num_clusters': num_clusters}
+            clusters = cached_stage(artifact_store, 'clusters', cluster_settings, fit_clusters)
+
+        data['Cluster'] = clusters['labels']
+        data['x'] = clusters['components'][:, 0]
+        data['y'] = clusters['components'][:, 1]
+
+        clustering = {'cross_session': cross_session,
+                      'num_clusters': cluster_model.n_clusters if cross_session else num_clusters}
+        return data, clustering
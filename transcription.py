@@ -2,8 +2,6 @@
 
 import torch
 import numpy as np
-import wave
-import contextlib
 from datetime import datetime, timedelta
 from sklearn.cluster import AgglomerativeClustering
 from speechbrain.inference import EncoderClassifier
@@ -11,34 +9,175 @@ from pyannote.audio import Audio
 from pyannote.core import Segment
 import whisper
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from artifacts import cached_stage
+from archive import audio_info, read_segment
 
-def transcribe_and_diarize(audio_path, num_speakers, recording_start_time, language='any', model_size='medium'):
-    # Load Whisper model
+SPEAKER_EMBEDDING_SOURCE = "speechbrain/spkrec-ecapa-voxceleb"
+SPEAKER_EMBEDDING_RATE = 16000  # Sample rate the ECAPA model was trained on
+
+# Sliding windows used by the 'windowed' diarization mode
+DIARIZATION_WINDOW = {'window': 1.5, 'hop': 0.75}
+
+# 'channel' mode: a segment belongs to a channel's speaker when that channel
+# carries this many dB more energy than the next loudest one
+CHANNEL_DOMINANCE_DB = 6.0
+CHANNEL_REFERENCE_SEGMENTS = 5  # Confident segments embedded per channel for the fallback
+
+WHISPER_SAMPLE_RATE = 16000
+
+def whisper_model_name(model_size, language='any'):
     model_name = model_size
     if language == 'English' and model_size != 'large':
         model_name += '.en'
-    model = whisper.load_model(model_name)
+    return model_name
+
+def load_whisper_model(model_size, language='any'):
+    return whisper.load_model(whisper_model_name(model_size, language))
+
+def transcribe_and_diarize(audio_path, num_speakers, recording_start_time, language='any', model_size='medium',
+                           artifact_store=None, diarization_mode='segment', speaker_db=None):
+    # Whisper model name
+    model_name = whisper_model_name(model_size, language)
+
+    # In 'windowed' mode speaker embeddings are computed on sliding windows in
+    # a worker thread while Whisper decodes, since they don't need the segments.
+    window_future = None
+    executor = None
+    if diarization_mode == 'windowed':
+        window_settings = dict(DIARIZATION_WINDOW, embedding_model=SPEAKER_EMBEDDING_SOURCE)
+        if artifact_store is not None:
+            # Hash the audio here so the two threads don't both compute it
+            artifact_store.audio_hash
+        executor = ThreadPoolExecutor(max_workers=1)
+        window_future = executor.submit(cached_stage, artifact_store, 'window_embeddings', window_settings,
+                                        lambda: compute_window_embeddings(audio_path, **DIARIZATION_WINDOW))
+        executor.shutdown(wait=False)
+
+    # Transcribe audio (models are only loaded when a stage is not cached)
+    def run_whisper():
+        model = load_whisper_model(model_size, language)
+        result = model.transcribe(audio_path)
+        return [{key: segment[key] for key in ('id', 'start', 'end', 'text')}
+                for segment in result.get("segments", [])]
 
-    # Transcribe audio
-    result = model.transcribe(audio_path)
-    segments = result.get("segments", [])
+    whisper_settings = {'model': model_name}
+    segments = cached_stage(artifact_store, 'whisper_segments', whisper_settings, run_whisper)
 
     if not segments:
         return None, None  # No speech detected
 
-    # Get audio duration
-    with contextlib.closing(wave.open(audio_path, 'r')) as f:
-        frames = f.getnframes()
-        rate = f.getframerate()
-        duration = frames / float(rate)
+    # With one lavalier mic per speaker, channel energy identifies most speakers directly
+    if diarization_mode == 'channel' and audio_info(audio_path)[2] < 2:
+        logging.warning("Channel diarization needs a multi-channel recording, using segment embeddings.")
+        diarization_mode = 'segment'
+
+    if diarization_mode == 'channel':
+        label_settings = dict(whisper_settings, embedding_model=SPEAKER_EMBEDDING_SOURCE, diarization=diarization_mode,
+                              dominance_db=CHANNEL_DOMINANCE_DB, num_speakers=num_speakers)
+        labels = cached_stage(artifact_store, 'speaker_labels', label_settings,
+                              lambda: channel_speaker_labels(audio_path, segments, num_speakers))
+        speakers = ['SPEAKER ' + str(label + 1) for label in labels]
+    else:
+        # Extract embeddings
+        embedding_settings = dict(whisper_settings, embedding_model=SPEAKER_EMBEDDING_SOURCE)
+        if window_future is not None:
+            embedding_settings.update(diarization=diarization_mode, **DIARIZATION_WINDOW)
+            windows = window_future.result()
+            embeddings = cached_stage(artifact_store, 'speaker_embeddings', embedding_settings,
+                                      lambda: pool_window_embeddings(windows, segments))
+        else:
+            embeddings = cached_stage(artifact_store, 'speaker_embeddings', embedding_settings,
+                                      lambda: compute_segment_embeddings(audio_path, segments))
+
+        if speaker_db is not None and len(speaker_db):
+            # Enrolled speakers are looked up directly; only the rest is clustered
+            speaker_settings = dict(embedding_settings, num_speakers=num_speakers,
+                                    speaker_db=speaker_db.fingerprint, threshold=speaker_db.threshold)
+            speakers = cached_stage(artifact_store, 'enrolled_speaker_labels', speaker_settings,
+                                    lambda: enrolled_speaker_labels(embeddings, speaker_db, num_speakers))
+        else:
+            # Perform clustering
+            def run_clustering():
+                clustering = AgglomerativeClustering(num_speakers).fit(embeddings)
+                return clustering.labels_
+
+            label_settings = dict(embedding_settings, num_speakers=num_speakers)
+            labels = cached_stage(artifact_store, 'speaker_labels', label_settings, run_clustering)
+            speakers = ['SPEAKER ' + str(label + 1) for label in labels]
+    for i in range(len(segments)):
+        segments[i]["speaker"] = speakers[i]
+
+    # Prepare transcription data
+    transcription = []
+    for (i, segment) in enumerate(segments):
+        segment_time = recording_start_time + timedelta(seconds=segment["start"])
+        speaker = segment["speaker"]
+        text = segment["text"].strip()
+        transcription.append({
+            'time': segment_time,
+            'speaker': speaker,
+            'text': text,
+            'start': segment["start"],  # Seconds into the recording, for seeking
+            'end': segment["end"]
+        })
+
+    # Prepare formatted transcription for display
+    formatted_transcript = "".join(text for text, _ in format_transcript(transcription))
+
+    return transcription, formatted_transcript
+
+def format_transcript(transcription):
+    """
+    Split the display transcript into (text, segment index) pieces; speaker
+    headers have no segment index. Joining the texts gives the transcript.
+    """
+    pieces = []
+    previous_speaker = None
+    for i, entry in enumerate(transcription):
+        current_speaker = entry['speaker']
+        current_time = entry['time'].strftime('%H:%M:%S')
+        if i == 0 or current_speaker != previous_speaker:
+            pieces.append((f"\n{current_speaker} {current_time}\n", None))
+        pieces.append((entry['text'] + ' ', i))
+        previous_speaker = current_speaker
+    return pieces
+
+def transcribe_chunk(model, samples, sample_rate, offset_seconds=0.0):
+    """
+    Transcribe a chunk of raw captured audio with an already loaded Whisper model.
+    Segment times are shifted by `offset_seconds`, the chunk's position in the recording.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)  # Whisper expects mono
+    if sample_rate != WHISPER_SAMPLE_RATE:
+        duration = len(samples) / sample_rate
+        target_times = np.arange(int(duration * WHISPER_SAMPLE_RATE)) / WHISPER_SAMPLE_RATE
+        samples = np.interp(target_times, np.arange(len(samples)) / sample_rate, samples).astype(np.float32)
 
-    # Initialize pyannote audio
-    audio = Audio()
+    result = model.transcribe(samples, fp16=torch.cuda.is_available())
+    return [{'start': offset_seconds + segment['start'], 'end': offset_seconds + segment['end'],
+             'text': segment['text'].strip()}
+            for segment in result.get("segments", []) if segment['text'].strip()]
+
+def load_speaker_encoder():
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
     embedding_model = EncoderClassifier.from_hparams(
-        source="speechbrain/spkrec-ecapa-voxceleb",
+        source=SPEAKER_EMBEDDING_SOURCE,
         run_opts={"device": device}
     )
+    return embedding_model, device
+
+def compute_segment_embeddings(audio_path, segments):
+    # Get audio duration (WAV or FLAC archive) without decoding the file
+    frames, rate, _ = audio_info(audio_path)
+    duration = frames / float(rate)
+
+    # Initialize pyannote audio (multi-channel recordings are mixed down and
+    # resampled to the encoder's rate, like the windowed embeddings)
+    audio = Audio(sample_rate=SPEAKER_EMBEDDING_RATE, mono='downmix')
+    embedding_model, device = load_speaker_encoder()
 
     # Define function to extract segment embeddings
     def segment_embedding(segment):
@@ -51,41 +190,130 @@ def transcribe_and_diarize(audio_path, num_speakers, recording_start_time, langu
             embeddings = embedding_model.encode_batch(waveform.to(device))
         return embeddings.squeeze(0).cpu().numpy()
 
-    # Extract embeddings
-    embeddings = np.zeros(shape=(len(segments), 192))
+    embeddings = np.zeros(shape=(len(segments), 192), dtype=np.float32)
     for i, segment in enumerate(segments):
         embeddings[i] = segment_embedding(segment)
 
-    embeddings = np.nan_to_num(embeddings)
+    return np.nan_to_num(embeddings)
 
-    # Perform clustering
-    clustering = AgglomerativeClustering(num_speakers).fit(embeddings)
-    labels = clustering.labels_
-    for i in range(len(segments)):
-        segments[i]["speaker"] = 'SPEAKER ' + str(labels[i] + 1)
+def compute_window_embeddings(audio_path, window, hop, batch_windows=64):
+    """
+    Speaker embeddings of overlapping `window`-second windows every `hop`
+    seconds over the whole recording, read and encoded in batches.
+    """
+    frames, rate, _ = audio_info(audio_path)
+    duration = frames / float(rate)
+    starts = np.arange(0, max(duration - window, 0) + hop / 2, hop)
 
-    # Prepare transcription data
-    transcription = []
-    for (i, segment) in enumerate(segments):
-        segment_time = recording_start_time + timedelta(seconds=segment["start"])
-        speaker = segment["speaker"]
-        text = segment["text"].strip()
-        transcription.append({
-            'time': segment_time,
-            'speaker': speaker,
-            'text': text
-        })
+    audio = Audio(sample_rate=SPEAKER_EMBEDDING_RATE, mono='downmix')
+    embedding_model, device = load_speaker_encoder()
+    window_samples = int(window * SPEAKER_EMBEDDING_RATE)
 
-    # Prepare formatted transcription for display
-    formatted_transcript = ""
-    previous_speaker = None
+    embeddings = np.zeros(shape=(len(starts), 192), dtype=np.float32)
+    for b in range(0, len(starts), batch_windows):
+        batch_starts = starts[b:b + batch_windows]
+        # One read covers every window of the batch
+        clip = Segment(batch_starts[0], min(duration, batch_starts[-1] + window))
+        waveform, _ = audio.crop(audio_path, clip)
+        waveform = waveform[0]
+        offsets = ((batch_starts - batch_starts[0]) * SPEAKER_EMBEDDING_RATE).astype(int)
+        batch = torch.zeros((len(batch_starts), window_samples))
+        for j, offset in enumerate(offsets):
+            piece = waveform[offset:offset + window_samples]  # The last window may be short
+            batch[j, :len(piece)] = piece
+        with torch.no_grad():
+            batch_embeddings = embedding_model.encode_batch(batch.to(device))
+        embeddings[b:b + len(batch_starts)] = batch_embeddings.squeeze(1).cpu().numpy()
+
+    return {'starts': starts, 'window': window, 'embeddings': np.nan_to_num(embeddings)}
+
+def pool_window_embeddings(windows, segments):
+    """
+    Embed each segment as the overlap-weighted mean of the sliding windows it
+    intersects, or the nearest window for segments shorter than the hop.
+    """
+    starts = windows['starts']
+    ends = starts + windows['window']
+    centers = starts + windows['window'] / 2
+
+    embeddings = np.zeros(shape=(len(segments), windows['embeddings'].shape[1]), dtype=np.float32)
     for i, segment in enumerate(segments):
-        current_speaker = segment["speaker"]
-        segment_time = recording_start_time + timedelta(seconds=segment["start"])
-        current_time = segment_time.strftime('%H:%M:%S')
-        if i == 0 or current_speaker != previous_speaker:
-            formatted_transcript += f"\n{current_speaker} {current_time}\n"
-        formatted_transcript += segment["text"][1:] + ' '
-        previous_speaker = current_speaker
+        overlap = np.minimum(ends, segment["end"]) - np.maximum(starts, segment["start"])
+        weights = np.clip(overlap, 0, None)
+        if weights.sum() > 0:
+            embeddings[i] = weights @ windows['embeddings'] / weights.sum()
+        else:
+            nearest = np.argmin(np.abs(centers - (segment["start"] + segment["end"]) / 2))
+            embeddings[i] = windows['embeddings'][nearest]
+    return embeddings
 
-    return transcription, formatted_transcript
+def channel_speaker_labels(audio_path, segments, num_speakers):
+    """
+    Label each segment with the channel whose energy dominates it. Only
+    ambiguous segments (crosstalk, both talking) are embedded; they take the
+    speaker of the closest channel centroid, built from a few confidently
+    assigned segments per channel.
+    """
+    labels = np.full(len(segments), -1)
+    for i, segment in enumerate(segments):
+        samples, _ = read_segment(audio_path, segment["start"], segment["end"])
+        if len(samples) == 0:
+            continue
+        energy = np.mean(samples.astype(np.float64) ** 2, axis=0)
+        loudest, second = np.argsort(energy)[::-1][:2]
+        if 10 * np.log10((energy[loudest] + 1e-12) / (energy[second] + 1e-12)) >= CHANNEL_DOMINANCE_DB:
+            labels[i] = loudest
+
+    ambiguous = np.flatnonzero(labels < 0)
+    logging.info(f"Channel diarization: {len(segments) - len(ambiguous)} segments by energy, "
+                 f"{len(ambiguous)} ambiguous.")
+    if len(ambiguous) == 0:
+        return labels
+
+    # Embed the ambiguous segments plus a few references spread over each channel
+    references = []
+    for channel in np.unique(labels[labels >= 0]):
+        confident = np.flatnonzero(labels == channel)
+        picks = np.linspace(0, len(confident) - 1, min(CHANNEL_REFERENCE_SEGMENTS, len(confident))).astype(int)
+        references.extend(confident[picks])
+    references = np.array(references, dtype=int)
+    to_embed = np.concatenate([ambiguous, references])
+    embeddings = compute_segment_embeddings(audio_path, [segments[i] for i in to_embed])
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12
+    ambiguous_embeddings = embeddings[:len(ambiguous)]
+
+    if len(references) == 0:
+        # No channel ever dominated: fall back to clustering everything
+        n_clusters = min(num_speakers, len(ambiguous))
+        if n_clusters < 2:
+            labels[ambiguous] = 0
+        else:
+            labels[ambiguous] = AgglomerativeClustering(n_clusters).fit(ambiguous_embeddings).labels_
+        return labels
+
+    reference_embeddings = embeddings[len(ambiguous):]
+    channels = np.unique(labels[references])
+    centroids = np.stack([reference_embeddings[labels[references] == channel].mean(axis=0) for channel in channels])
+    labels[ambiguous] = channels[np.argmax(ambiguous_embeddings @ centroids.T, axis=1)]
+    return labels
+
+def enrolled_speaker_labels(embeddings, speaker_db, num_speakers):
+    """
+    Name segments after their nearest enrolled speaker and cluster only the
+    unmatched remainder into anonymous speakers.
+    """
+    speakers, _ = speaker_db.match(embeddings)
+    unmatched = [i for i, speaker in enumerate(speakers) if speaker is None]
+    logging.info(f"Enrolled speakers matched {len(speakers) - len(unmatched)} of {len(speakers)} segments.")
+    if not unmatched:
+        return speakers
+
+    # Speakers already recognized don't need a cluster of their own
+    n_clusters = min(max(num_speakers - len(set(speakers) - {None}), 1), len(unmatched))
+    if n_clusters > 1:
+        labels = AgglomerativeClustering(n_clusters).fit(embeddings[unmatched]).labels_
+    else:
+        labels = np.zeros(len(unmatched), dtype=int)
+    for i, label in zip(unmatched, labels):
+        speakers[i] = 'SPEAKER ' + str(label + 1)
+    return speakers